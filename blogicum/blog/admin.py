@@ -1,8 +1,147 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-from .models import Category, Location, Post, Comment
+from .deletion import schedule_user_deletion
+from .models import Category, DeletionJob, Location, Post, Comment, User
+from .utils import prefix_search
+from core.writes import serialized_write, write_lock
 
-admin.site.register(Category)
-admin.site.register(Location)
-admin.site.register(Post)
-admin.site.register(Comment)
+
+class PrefixSearchMixin:
+    """Autocomplete by an indexed prefix of `prefix_search_field`
+    instead of `icontains` over every search field."""
+    prefix_search_field = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if request.resolver_match.url_name != 'autocomplete':
+            return super().get_search_results(
+                request, queryset, search_term)
+        if not search_term:
+            return queryset, False
+        return prefix_search(
+            queryset, self.prefix_search_field, search_term), False
+
+
+class PublishActionsMixin:
+    """Bulk publishing with one UPDATE and one visibility refresh of the
+    posts it affects: those whose `post_lookup` is among the selected."""
+    actions = ('publish', 'unpublish')
+    post_lookup = 'pk'
+
+    @admin.action(description='Опубликовать выбранные')
+    def publish(self, request, queryset):
+        self.set_published(request, queryset, True)
+
+    @admin.action(description='Снять с публикации выбранные')
+    def unpublish(self, request, queryset):
+        self.set_published(request, queryset, False)
+
+    def set_published(self, request, queryset, value):
+        updated = serialized_write(self._set_published)(queryset, value)
+        self.message_user(request, f'Обновлено записей: {updated}.')
+
+    def _set_published(self, queryset, value):
+        # The changelist filters may stop matching after the UPDATE.
+        pks = list(queryset.values_list('pk', flat=True))
+        updated = queryset.model.objects.filter(pk__in=pks).update(
+            is_published=value)
+        # Visibility of posts follows both their own and category flags.
+        Post.objects.filter(
+            **{f'{self.post_lookup}__in': pks}).publish_due()
+        return updated
+
+
+@admin.register(Category)
+class CategoryAdmin(
+        PrefixSearchMixin, PublishActionsMixin, admin.ModelAdmin):
+    list_display = ('title', 'slug', 'is_published', 'created_at')
+    list_filter = ('is_published',)
+    search_fields = ('title',)
+    prefix_search_field = 'title'
+    ordering = ('title',)
+    show_full_result_count = False
+    post_lookup = 'category'
+
+
+@admin.register(Location)
+class LocationAdmin(PrefixSearchMixin, admin.ModelAdmin):
+    list_display = ('name', 'is_published', 'created_at')
+    list_filter = ('is_published',)
+    search_fields = ('name',)
+    prefix_search_field = 'name'
+    ordering = ('name',)
+    show_full_result_count = False
+
+
+@admin.register(Post)
+class PostAdmin(PublishActionsMixin, admin.ModelAdmin):
+    list_display = (
+        'title', 'author', 'category', 'location', 'pub_date',
+        'is_published', 'is_visible'
+    )
+    list_select_related = ('author', 'category', 'location')
+    list_filter = ('is_published', 'is_visible', 'category')
+    # `=` makes the username lookup exact, so it uses the unique index.
+    search_fields = ('^title', '=author__username')
+    autocomplete_fields = ('author', 'category', 'location')
+    show_full_result_count = False
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'author', 'post', 'created_at')
+    list_select_related = ('author', 'post')
+    search_fields = ('=author__username',)
+    autocomplete_fields = ('author',)
+    raw_id_fields = ('post',)
+    show_full_result_count = False
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class UserAdmin(PrefixSearchMixin, BaseUserAdmin):
+    """Deleting a user deactivates them and queues a `DeletionJob`."""
+    prefix_search_field = 'username'
+
+    def get_deleted_objects(self, objs, request):
+        # The cascade collector would load everything the users wrote
+        # just to list it on the confirmation page.
+        users = list(objs)
+        model_count = {User._meta.verbose_name_plural: len(users)}
+        return [str(user) for user in users], model_count, set(), []
+
+    def delete_view(self, request, object_id, extra_context=None):
+        # The view runs in a transaction, the write lock goes first.
+        if request.method != 'POST':
+            return super().delete_view(request, object_id, extra_context)
+        with write_lock():
+            return super().delete_view(request, object_id, extra_context)
+
+    def delete_model(self, request, obj):
+        schedule_user_deletion(obj)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            schedule_user_deletion(user)
+
+
+@admin.register(DeletionJob)
+class DeletionJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'username', 'status', 'progress', 'created_at', 'finished_at'
+    )
+    list_filter = ('status',)
+    readonly_fields = (
+        'user', 'username', 'status', 'total', 'deleted', 'created_at',
+        'finished_at'
+    )
+
+    @admin.display(description='Прогресс')
+    def progress(self, job):
+        percent = 100 * job.deleted // job.total if job.total else 100
+        return f'{job.deleted} из {job.total} ({percent}%)'
+
+    def has_add_permission(self, request):
+        return False
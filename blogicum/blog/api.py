@@ -0,0 +1,222 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import wraps
+
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
+
+from .caching import read_params
+from .models import Category, Comment, Location, Post, User
+from .utils import prefix_search
+from blogicum.settings import API_MAX_LIMIT, POSTS_IN_PAGE
+
+POST_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': 'location__name',
+    'image': 'image',
+    # Maintained by signals, every visible post has a feed entry.
+    'comment_count': 'feed_entry__comment_count',
+}
+COMMENT_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'created_at': 'created_at',
+    'author': 'author__username',
+    'post': 'post_id',
+}
+
+AUTOCOMPLETE = {
+    'category': (Category.objects.filter(is_published=True), 'title'),
+    'location': (Location.objects.filter(is_published=True), 'name'),
+}
+
+
+# Every query parameter the API reads; the rest is ignored, also by the
+# page cache.
+QUERY_PARAMS = ('fields', 'limit', 'cursor')
+
+
+class ApiError(Exception):
+    pass
+
+
+def _encode_cursor(value, pk):
+    raw = json.dumps([value.isoformat(), pk])
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        value, pk = json.loads(urlsafe_b64decode(cursor.encode()))
+        value, pk = parse_datetime(value), int(pk)
+    except (ValueError, TypeError):
+        raise ApiError('Некорректный cursor.')
+    if value is None:
+        raise ApiError('Некорректный cursor.')
+    return value, pk
+
+
+def _get_fields(request, available):
+    names = request.GET.get('fields')
+    if not names:
+        return dict(available)
+    fields = {}
+    for name in names.split(','):
+        if name not in available:
+            raise ApiError(f'Неизвестное поле: {name}.')
+        fields[name] = available[name]
+    return fields
+
+
+def _get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', POSTS_IN_PAGE))
+    except ValueError:
+        raise ApiError('Некорректный limit.')
+    return max(1, min(limit, API_MAX_LIMIT))
+
+
+def _item(row, fields):
+    item = {name: row[path] for name, path in fields.items()}
+    if 'image' in item:
+        item['image'] = (
+            default_storage.url(item['image']) if item['image'] else None
+        )
+    return item
+
+
+def _serialize(row, fields):
+    return json.dumps(
+        _item(row, fields), cls=DjangoJSONEncoder, ensure_ascii=False
+    )
+
+
+def _stream_page(request, queryset, fields, sort_field, descending=True):
+    """Stream one cursor page of `queryset` ordered by (`sort_field`, pk)."""
+    limit = _get_limit(request)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        value, pk = _decode_cursor(cursor)
+        lookup = 'lt' if descending else 'gt'
+        queryset = queryset.filter(
+            Q(**{f'{sort_field}__{lookup}': value})
+            | Q(**{sort_field: value, f'pk__{lookup}': pk})
+        )
+    order = [sort_field, 'pk']
+    if descending:
+        order = [f'-{name}' for name in order]
+    paths = set(fields.values()) | {sort_field, 'pk'}
+    rows = queryset.order_by(*order).values(*paths)[:limit + 1]
+
+    def content():
+        yield '{"results": ['
+        last = None
+        for count, row in enumerate(rows.iterator()):
+            if count == limit:
+                params = read_params(request, QUERY_PARAMS)
+                params['cursor'] = _encode_cursor(
+                    last[sort_field], last['pk']
+                )
+                next_url = request.build_absolute_uri(
+                    f'{request.path}?{params.urlencode()}'
+                )
+                yield f'], "next": {json.dumps(next_url)}}}'
+                return
+            yield (',' if count else '') + _serialize(row, fields)
+            last = row
+        yield '], "next": null}'
+
+    return StreamingHttpResponse(content(), content_type='application/json')
+
+
+def api_view(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({'detail': str(error)}, status=400)
+        except Http404:
+            return JsonResponse({'detail': 'Не найдено.'}, status=404)
+    return wrapper
+
+
+def _post_page(request, queryset):
+    fields = _get_fields(request, POST_FIELDS)
+    return _stream_page(request, queryset, fields, 'pub_date')
+
+
+@api_view
+def post_list(request):
+    """Feed."""
+    return _post_page(request, Post.objects.published())
+
+
+@api_view
+def category_post_list(request, category_slug):
+    """Category feed."""
+    category = get_object_or_404(
+        Category, slug=category_slug, is_published=True
+    )
+    return _post_page(
+        request, Post.objects.published().filter(category=category)
+    )
+
+
+@api_view
+def profile_post_list(request, username):
+    """Author feed."""
+    author = get_object_or_404(User, username=username, is_active=True)
+    return _post_page(
+        request, Post.objects.published().filter(author=author)
+    )
+
+
+@api_view
+def post_detail(request, pk):
+    """Post."""
+    fields = _get_fields(request, POST_FIELDS)
+    queryset = Post.objects.published().filter(pk=pk)
+    row = queryset.values(*fields.values()).first()
+    if row is None:
+        raise Http404
+    return JsonResponse(
+        _item(row, fields), json_dumps_params={'ensure_ascii': False}
+    )
+
+
+@api_view
+def comment_list(request, pk):
+    """Comments of a post."""
+    post = get_object_or_404(Post.objects.published(), pk=pk)
+    fields = _get_fields(request, COMMENT_FIELDS)
+    return _stream_page(
+        request, Comment.objects.filter(post=post), fields,
+        'created_at', descending=False
+    )
+
+
+@api_view
+def autocomplete(request, field):
+    """Choices of a `PostForm` field whose label starts with `term`."""
+    if field not in AUTOCOMPLETE:
+        raise Http404
+    queryset, label = AUTOCOMPLETE[field]
+    term = request.GET.get('term', '').strip()
+    rows = []
+    if term:
+        rows = prefix_search(queryset, label, term).order_by(
+            label).values_list('pk', label)[:_get_limit(request)]
+    return JsonResponse(
+        {'results': [{'id': pk, 'text': text} for pk, text in rows]},
+        json_dumps_params={'ensure_ascii': False}
+    )
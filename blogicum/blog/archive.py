@@ -0,0 +1,73 @@
+"""Hot/cold split of posts: `archive_posts` moves old posts and their
+comments to `ArchivedPost`/`ArchivedComment`, detail and profile pages
+fall back to them."""
+from django.db import connections, transaction
+
+from .caching import bump_feed_version
+from .models import ArchivedComment, ArchivedPost, Comment, FeedEntry, Post
+from core.writes import serialized_write
+
+
+def _copy(target, queryset):
+    """INSERT ... SELECT, the rows never pass through Python however
+    many comments the posts have."""
+    connection = connections[queryset.db]
+    quote = connection.ops.quote_name
+    fields = target._meta.concrete_fields
+    select, params = queryset.values(
+        *(field.attname for field in fields)
+    ).query.get_compiler(queryset.db).as_sql()
+    columns = ', '.join(quote(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {quote(target._meta.db_table)} ({columns}) '
+            f'{select}', params
+        )
+
+
+@serialized_write
+def archive(pks):
+    """Move the posts `pks` with their comments to the archive in one
+    short transaction."""
+    posts = Post.objects.filter(pk__in=pks)
+    comments = Comment.objects.filter(post__in=pks)
+    _copy(ArchivedPost, posts)
+    _copy(ArchivedComment, comments)
+    # Rows are copied already, the cascade collector and per-object
+    # signals would only load them again.
+    for queryset in (comments, FeedEntry.objects.filter(post__in=pks), posts):
+        queryset._raw_delete(queryset.db)
+    transaction.on_commit(bump_feed_version)
+
+
+class ChainedPosts:
+    """`hot` followed by `cold` for a Paginator; both are ordered by
+    descending pub_date and every archived post is older than the
+    posts left."""
+
+    def __init__(self, hot, cold, counts=None):
+        self.hot = hot
+        self.cold = cold
+        if counts is not None:
+            self._counts = counts
+
+    def count(self):
+        if not hasattr(self, '_counts'):
+            self._counts = self.hot.count(), self.cold.count()
+        return sum(self._counts)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        self.count()
+        hot_count = self._counts[0]
+        start, stop = index.start or 0, index.stop
+        items = list(self.hot[start:min(stop, hot_count)]) \
+            if start < hot_count else []
+        if stop > hot_count:
+            items += list(
+                self.cold[max(start - hot_count, 0):stop - hot_count])
+        return items
@@ -0,0 +1,181 @@
+"""Async versions of the feed and post pages, served under ASGI when
+`ASYNC_VIEWS` is on.
+
+The ORM, the cache and template rendering are blocking, so they go through
+`run_sync` and its bounded executor; lookups that don't depend on each
+other run concurrently. The feeds keep post cards as rendered HTML in the
+cache until the next change of the published posts, and the number of
+entries of each feed as well.
+"""
+import asyncio
+
+from django.contrib.auth.views import redirect_to_login
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.shortcuts import get_object_or_404, render
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .archive import ChainedPosts
+from .caching import get_feed_version
+from .forms import CommentForm
+from .models import ArchivedPost, Category, Comment, FeedEntry, Post, User
+from .views import archived_posts, profile_posts
+from blogicum.settings import FEED_CACHE_TIMEOUT, POSTS_IN_PAGE
+from core.aio import run_sync
+from core.replicas import replica_reads
+
+CARD_TEMPLATE = 'includes/post_card.html'
+
+
+class Card:
+    """A post card rendered in advance, for the `post.card` branch of
+    the feed templates."""
+
+    def __init__(self, html):
+        self.card = mark_safe(html)
+
+
+def _count(entries, key):
+    count = cache.get(key)
+    if count is None:
+        count = entries.count()
+        cache.set(key, count, FEED_CACHE_TIMEOUT)
+    return count
+
+
+def _page_ids(entries, number):
+    bottom = (number - 1) * POSTS_IN_PAGE
+    return list(entries.values_list(
+        'post_id', flat=True)[bottom:bottom + POSTS_IN_PAGE])
+
+
+def _render_cards(ids):
+    entries = FeedEntry.objects.filter(post_id__in=ids).select_related(
+        'post__author', 'post__category', 'post__location'
+    )
+    cards = {}
+    for entry in entries:
+        entry.post.comment_count = entry.comment_count
+        cards[entry.post_id] = render_to_string(
+            CARD_TEMPLATE, {'post': entry.post})
+    return cards
+
+
+async def _cards(version, ids):
+    keys = {post_id: f'blog:card:{version}:{post_id}' for post_id in ids}
+    cached = await run_sync(cache.get_many, list(keys.values()))
+    cards = {
+        post_id: cached[key] for post_id, key in keys.items()
+        if key in cached
+    }
+    missing = [post_id for post_id in ids if post_id not in cards]
+    if missing:
+        rendered = await run_sync(_render_cards, missing)
+        await run_sync(cache.set_many, {
+            keys[post_id]: html for post_id, html in rendered.items()
+        }, FEED_CACHE_TIMEOUT)
+        cards.update(rendered)
+    return [Card(cards[post_id]) for post_id in ids if post_id in cards]
+
+
+def _page_number(value):
+    try:
+        return max(int(value), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+async def feed_page(request, entries, key):
+    """Async `views.feed_page`: the count and the ids of the requested
+    page are fetched concurrently, then the cards of the page."""
+    version = await run_sync(get_feed_version)
+    entries = entries.order_by('-pub_date', '-post')
+    paginator = Paginator(entries, POSTS_IN_PAGE)
+    number = _page_number(request.GET.get('page'))
+    paginator.count, ids = await asyncio.gather(
+        run_sync(_count, entries, f'blog:count:{version}:{key}'),
+        run_sync(_page_ids, entries, number),
+    )
+    page_obj = paginator.get_page(request.GET.get('page'))
+    if page_obj.number != number:
+        ids = await run_sync(_page_ids, entries, page_obj.number)
+    page_obj.object_list = await _cards(version, ids)
+    return page_obj
+
+
+@replica_reads
+async def index(request):
+    """Homepage."""
+    page_obj = await feed_page(request, FeedEntry.objects.all(), 'index')
+    return await run_sync(
+        render, request, 'blog/index.html', {'page_obj': page_obj})
+
+
+@replica_reads
+async def category_posts(request, category_slug):
+    """Category view."""
+    category, page_obj = await asyncio.gather(
+        run_sync(
+            get_object_or_404,
+            Category.objects.filter(is_published=True),
+            slug=category_slug
+        ),
+        feed_page(
+            request, FeedEntry.objects.filter(category_slug=category_slug),
+            f'category:{category_slug}'
+        ),
+    )
+    context = {'page_obj': page_obj,
+               'category': category}
+    return await run_sync(render, request, 'blog/category.html', context)
+
+
+def _is_owner(request, user):
+    return request.user == user
+
+
+@replica_reads
+async def profile(request, username):
+    """User page."""
+    user = await run_sync(
+        get_object_or_404, User, username=username, is_active=True)
+    posts = profile_posts(user, await run_sync(_is_owner, request, user))
+    counts = await asyncio.gather(
+        run_sync(posts.hot.count), run_sync(posts.cold.count))
+    posts = ChainedPosts(posts.hot, posts.cold, counts)
+    page_obj = await run_sync(
+        Paginator(posts, POSTS_IN_PAGE).get_page, request.GET.get('page'))
+    context = {'profile': user, 'page_obj': page_obj}
+    return await run_sync(render, request, 'blog/profile.html', context)
+
+
+def _is_authenticated(request):
+    return request.user.is_authenticated
+
+
+def _get_post(pk):
+    post = Post.objects.with_related().filter(pk=pk).first()
+    if post is None:
+        post = get_object_or_404(archived_posts(), pk=pk)
+    return post
+
+
+@replica_reads
+async def post_detail(request, pk):
+    """Post view."""
+    if not await run_sync(_is_authenticated, request):
+        return redirect_to_login(request.get_full_path())
+    post, comments = await asyncio.gather(
+        run_sync(_get_post, pk),
+        run_sync(list, Comment.objects.filter(
+            post_id=pk).select_related('author')),
+    )
+    archived = isinstance(post, ArchivedPost)
+    if archived:
+        comments = await run_sync(
+            list, post.comments.select_related('author'))
+    context = {'post': post, 'comments': comments, 'archived': archived}
+    if not archived:
+        context['form'] = CommentForm()
+    return await run_sync(render, request, 'blog/detail.html', context)
@@ -0,0 +1,179 @@
+import json
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Comment, Post
+
+SCALES = {
+    '1k': 1_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+URL_NAMESPACES = ('blog', 'pages')
+# Allowed relative slowdown of p50/p95 and absolute slack in ms for
+# very fast views where the relative noise is large.
+LATENCY_TOLERANCE = 0.5
+LATENCY_SLACK_MS = 5
+BYTES_TOLERANCE = 0.1
+
+
+def seed(posts, seed=1):
+    """Fill the current database with a dataset of `posts` posts."""
+    call_command(
+        'generate_data',
+        users=max(posts // 10, 10),
+        categories=20,
+        locations=200,
+        posts=posts,
+        comments=posts * 3,
+        seed=seed,
+        verbosity=0,
+    )
+
+
+def sample_kwargs():
+    """URL arguments pointing to the most commented visible post."""
+    post = Post.objects.published().annotate(
+        comment_total=Count('comments')
+    ).order_by('-comment_total', 'pk').select_related(
+        'author', 'category'
+    ).first()
+    comment = Comment.objects.filter(
+        post=post, author=post.author
+    ).order_by('pk').first()
+    if comment is None:
+        comment = Comment.objects.create(
+            post=post, author=post.author, text='Комментарий автора'
+        )
+    return post.author, {
+        'pk': post.pk,
+        'comment_id': comment.pk,
+        'category_slug': post.category.slug,
+        'username': post.author.username,
+        'section': 'posts',
+        'field': 'category',
+        'page': 0,
+    }
+
+
+def named_urls(values):
+    """(name, url) of every named URL in `URL_NAMESPACES`."""
+    from blog.urls import urlpatterns as blog_urls
+    from pages.urls import urlpatterns as pages_urls
+    for namespace, patterns in zip(URL_NAMESPACES, (blog_urls, pages_urls)):
+        for pattern in patterns:
+            name = f'{namespace}:{pattern.name}'
+            kwargs = {key: values[key] for key in pattern.pattern.converters}
+            yield name, reverse(name, kwargs=kwargs)
+
+
+def _get(client, url):
+    started = time.perf_counter()
+    response = client.get(url)
+    if response.streaming:
+        content = b''.join(response.streaming_content)
+    else:
+        content = response.content
+    return (time.perf_counter() - started) * 1000, response, len(content)
+
+
+def _percentiles(timings):
+    quantiles = statistics.quantiles(timings, n=20, method='inclusive')
+    return round(statistics.median(timings), 2), round(quantiles[-1], 2)
+
+
+def measure(client, url, repeat):
+    """Query count and bytes of a cold request, latency percentiles
+    over `repeat` cold requests, with the cache cleared before each, and
+    over `repeat` warm ones."""
+    cache.clear()
+    connection.queries_log.clear()
+    with CaptureQueriesContext(connection) as queries:
+        _, response, size = _get(client, url)
+    query_count = len(queries)
+    cold = []
+    warm = []
+    for _ in range(max(repeat, 2)):
+        cache.clear()
+        cold.append(_get(client, url)[0])
+        warm.append(_get(client, url)[0])
+    p50, p95 = _percentiles(cold)
+    warm_p50, warm_p95 = _percentiles(warm)
+    return {
+        'status': response.status_code,
+        'queries': query_count,
+        'p50_ms': p50,
+        'p95_ms': p95,
+        'warm_p50_ms': warm_p50,
+        'warm_p95_ms': warm_p95,
+        'bytes': size,
+    }
+
+
+def run(repeat=20):
+    author, values = sample_kwargs()
+    client = Client()
+    client.force_login(author)
+    return {
+        name: measure(client, url, repeat)
+        for name, url in named_urls(values)
+    }
+
+
+def compare(results, baseline, check_latency=True):
+    """Human readable regressions of `results` against `baseline`."""
+    problems = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['status'] != expected['status']:
+            problems.append(
+                f'{name}: статус {result["status"]}, '
+                f'ожидался {expected["status"]}'
+            )
+        if result['queries'] > expected['queries']:
+            problems.append(
+                f'{name}: {result["queries"]} запросов к БД, '
+                f'в базовой линии {expected["queries"]}'
+            )
+        size_limit = expected['bytes'] * (1 + BYTES_TOLERANCE)
+        if result['bytes'] > size_limit:
+            problems.append(
+                f'{name}: {result["bytes"]} байт, '
+                f'в базовой линии {expected["bytes"]}'
+            )
+        if not check_latency:
+            continue
+        for key in ('p50_ms', 'p95_ms', 'warm_p50_ms', 'warm_p95_ms'):
+            if key not in expected:
+                continue
+            limit = expected[key] * (1 + LATENCY_TOLERANCE) + LATENCY_SLACK_MS
+            if result[key] > limit:
+                problems.append(
+                    f'{name}: {key} = {result[key]}, '
+                    f'в базовой линии {expected[key]}'
+                )
+    return problems
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as stream:
+            return json.load(stream)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path, baseline):
+    with open(path, 'w', encoding='utf-8') as stream:
+        json.dump(baseline, stream, indent=2, sort_keys=True)
+        stream.write('\n')
@@ -0,0 +1,99 @@
+import os
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from hashlib import md5
+from pathlib import Path
+
+from django.core.cache import cache
+from django.http import HttpResponse, QueryDict
+from django.views.decorators.http import condition
+
+from blogicum.settings import FEED_CACHE_TIMEOUT, FEED_VERSION_FILE
+
+
+def get_feed_version():
+    """Timestamp of the last change to the published posts.
+
+    It is the mtime of `FEED_VERSION_FILE`, so a bump from a command or
+    another worker reaches every process, unlike the per-process cache.
+    """
+    try:
+        return os.stat(FEED_VERSION_FILE).st_mtime
+    except FileNotFoundError:
+        return bump_feed_version()
+
+
+def bump_feed_version():
+    """Invalidate every page cached with `cached_view`."""
+    path = Path(FEED_VERSION_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+    return os.stat(path).st_mtime
+
+
+def read_params(request, names):
+    """Only the query parameters `names` of `request`, in that order."""
+    params = QueryDict(mutable=True)
+    for name in names:
+        if name in request.GET:
+            params.setlist(name, request.GET.getlist(name))
+    return params
+
+
+def _etag(request, query_params):
+    params = read_params(request, query_params).urlencode()
+    key = f'{get_feed_version()}:{request.path}?{params}'
+    return md5(key.encode()).hexdigest()
+
+
+def _last_modified(request, *args, **kwargs):
+    return datetime.fromtimestamp(get_feed_version(), tz=timezone.utc)
+
+
+def _cache_stream(key, streaming_content, content_type):
+    chunks = []
+    for chunk in streaming_content:
+        chunks.append(chunk)
+        yield chunk
+    cache.set(key, (b''.join(chunks), content_type), FEED_CACHE_TIMEOUT)
+
+
+def cached_view(view, query_params=()):
+    """Cache a GET view until the next post change and answer
+    conditional requests with 304.
+
+    Only `query_params`, the query parameters the view reads, are part of
+    the key, so other ones neither add entries nor bypass the cache.
+    """
+
+    def etag(request, *args, **kwargs):
+        return _etag(request, query_params)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = f'blog:page:{etag(request)}'
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+        response = view(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        if response.streaming:
+            response.streaming_content = _cache_stream(
+                key, response.streaming_content, response['Content-Type']
+            )
+        else:
+            cache.set(
+                key,
+                (response.content, response['Content-Type']),
+                FEED_CACHE_TIMEOUT
+            )
+        return response
+
+    return condition(
+        etag_func=etag, last_modified_func=_last_modified
+    )(wrapper)
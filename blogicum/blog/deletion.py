@@ -0,0 +1,136 @@
+"""Deletion in small steps, so no write transaction grows with the amount
+of data removed.
+
+`Post.soft_delete` hides a post at once and `purge_deleted` later removes
+its comments in batches, the row and the image. `schedule_user_deletion`
+deactivates a user and hides their posts, then `run_deletion_jobs` removes
+their comments, posts and archived posts the same way and finally the user.
+"""
+import time
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .caching import bump_feed_version
+from .models import (
+    ArchivedComment, ArchivedPost, Comment, DeletionJob, FeedEntry, Post,
+    User
+)
+from .utils import iter_batches
+from core.writes import serialized_write
+
+
+def _delete_batch(comments, batch_size):
+    """Delete up to `batch_size` of `comments`, return their post ids."""
+    rows = list(comments.values_list('pk', 'post_id')[:batch_size])
+    # Loading the rows for the cascade collector and per-object signals
+    # is exactly the cost this module avoids.
+    batch = comments.filter(pk__in=[pk for pk, _ in rows])
+    batch._raw_delete(batch.db)
+    return [post_id for _, post_id in rows]
+
+
+@serialized_write
+def purge_comments(comments, batch_size):
+    """Delete up to `batch_size` of `comments`, return how many."""
+    return len(_delete_batch(comments, batch_size))
+
+
+@serialized_write
+def purge_post(post):
+    """Delete the row of a post without comments left, and its image
+    after the commit."""
+    posts = type(post)._base_manager.filter(pk=post.pk)
+    posts._raw_delete(posts.db)
+    if post.image:
+        transaction.on_commit(lambda: post.image.delete(save=False))
+
+
+def purge(post, batch_size=1000, pause=None):
+    """Remove a hidden or archived post with its comments, return the
+    number of comments."""
+    deleted = 0
+    while True:
+        count = purge_comments(post.comments.all(), batch_size)
+        deleted += count
+        if count < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    purge_post(post)
+    return deleted
+
+
+def _remaining(user_id):
+    return sum(
+        model._base_manager.filter(author_id=user_id).count()
+        for model in (Comment, ArchivedComment, Post, ArchivedPost)
+    )
+
+
+@serialized_write
+def schedule_user_deletion(user):
+    """Deactivate `user` and hide their posts at once, return the job
+    that removes the rest."""
+    job = user.deletion_jobs.exclude(status=DeletionJob.DONE).first()
+    if job is not None:
+        return job
+    user.is_active = False
+    user.save(update_fields=['is_active'])
+    posts = Post.objects.filter(author=user)
+    FeedEntry.objects.filter(post__in=posts).delete()
+    posts.update(deleted_at=timezone.now(), is_visible=False)
+    transaction.on_commit(bump_feed_version)
+    return DeletionJob.objects.create(
+        user=user, username=user.username, total=_remaining(user.pk)
+    )
+
+
+def _advance(job, count):
+    job.deleted += count
+    DeletionJob.objects.filter(pk=job.pk).update(
+        deleted=F('deleted') + count
+    )
+
+
+@serialized_write
+def _purge_user_comments(job, comments, batch_size):
+    post_ids = _delete_batch(comments, batch_size)
+    if comments.model is Comment:
+        for post_id, count in Counter(post_ids).items():
+            FeedEntry.objects.filter(post_id=post_id).update(
+                comment_count=F('comment_count') - count
+            )
+        transaction.on_commit(bump_feed_version)
+    _advance(job, len(post_ids))
+    return len(post_ids)
+
+
+@serialized_write
+def _finish(job):
+    User.objects.filter(pk=job.user_id).delete()
+    job.status = DeletionJob.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at'])
+
+
+def run_deletion_job(job, batch_size=1000, pause=None):
+    """Delete what is left of the job's user; the progress is committed
+    with every batch, so an interrupted job just runs again."""
+    job.status = DeletionJob.RUNNING
+    job.save(update_fields=['status'])
+    user_id = job.user_id
+    for model in (Comment, ArchivedComment):
+        comments = model.objects.filter(author_id=user_id)
+        while _purge_user_comments(job, comments, batch_size) == batch_size:
+            if pause:
+                time.sleep(pause)
+    for model in (Post, ArchivedPost):
+        posts = model._base_manager.filter(author_id=user_id)
+        for batch in iter_batches(posts, batch_size):
+            for post in batch:
+                purge(post, batch_size, pause)
+                _advance(job, 1)
+    _finish(job)
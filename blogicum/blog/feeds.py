@@ -0,0 +1,95 @@
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+from .models import Category, Post, User
+from blogicum.settings import FEED_ITEMS
+
+
+class LatestPostsFeed(Feed):
+    """Site feed."""
+    title = 'Блогикум'
+    link = reverse_lazy('blog:index')
+    description = 'Новые публикации Блогикума'
+
+    def get_posts(self, obj):
+        return Post.objects.published().with_related()
+
+    def items(self, obj=None):
+        return self.get_posts(obj).order_by('-pub_date')[:FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(item.text).words(50)
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_categories(self, item):
+        return (item.category.title,)
+
+
+class CategoryPostsFeed(LatestPostsFeed):
+    """Category feed."""
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=[obj.slug])
+
+    def description(self, obj):
+        return obj.description
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(category=obj)
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    """Author feed."""
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username, is_active=True)
+
+    def title(self, obj):
+        return f'Блогикум: @{obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=[obj.username])
+
+    def description(self, obj):
+        return f'Публикации пользователя {obj.username}'
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(author=obj)
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return obj.description
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
@@ -1,15 +1,62 @@
 from django import forms
+from django.urls import reverse_lazy
 
-from .models import Comment, Post
+from .models import Comment, Post, User
+
+
+class AutocompleteSelect(forms.Select):
+    """Select with only the chosen option; the others are loaded from
+    `url` as the user types, so rendering doesn't depend on the table
+    size."""
+
+    # The chosen object when the form already has it loaded.
+    chosen = None
+
+    class Media:
+        js = ('js/autocomplete.js',)
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = self.url
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        selected = [pk for pk in value if pk not in field.empty_values]
+        options = [self.create_option(
+            name, '', field.empty_label or '', not selected, 0)]
+        if self.chosen is not None and [str(self.chosen.pk)] == selected:
+            objects = [self.chosen]
+        else:
+            objects = field.queryset.filter(pk__in=selected)
+        for index, obj in enumerate(objects, 1):
+            options.append(self.create_option(
+                name, obj.pk, field.label_from_instance(obj), True, index))
+        return [(None, options, 0)]
 
 
 class PostForm(forms.ModelForm):
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in ('category', 'location'):
+            if Post._meta.get_field(name).is_cached(self.instance):
+                self.fields[name].widget.chosen = getattr(
+                    self.instance, name)
+
     class Meta:
         model = Post
         exclude = ('author',)
         widgets = {
-            'pub_date': forms.DateInput(attrs={'type': 'datetime-local'})
+            'pub_date': forms.DateInput(attrs={'type': 'datetime-local'}),
+            'category': AutocompleteSelect(
+                reverse_lazy('blog:api_autocomplete', args=['category'])),
+            'location': AutocompleteSelect(
+                reverse_lazy('blog:api_autocomplete', args=['location'])),
         }
 
 
@@ -18,3 +65,18 @@ class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
         fields = ('text',)
+
+
+class ProfileForm(forms.ModelForm):
+
+    class Meta:
+        model = User
+        fields = ('first_name', 'last_name', 'username', 'email')
+
+    def save(self, commit=True):
+        """Write only the changed columns of an existing user."""
+        if not commit or self.instance.pk is None:
+            return super().save(commit)
+        if self.changed_data:
+            self.instance.save(update_fields=self.changed_data)
+        return self.instance
@@ -0,0 +1,40 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.archive import archive
+from blog.models import Post
+from blog.utils import iter_batches
+
+
+class Command(BaseCommand):
+    help = ('Переносит старые публикации с комментариями в архивные '
+            'таблицы небольшими транзакциями.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=730,
+            help='Архивировать публикации старше стольких дней.')
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Сколько публикаций переносить в одной транзакции.')
+        parser.add_argument(
+            '--pause', type=float, default=0.1,
+            help='Пауза между транзакциями, чтобы не задерживать '
+            'запись с сайта, секунды.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        posts = Post.objects.filter(pub_date__lt=cutoff).values('pk')
+        moved = 0
+        for batch in iter_batches(posts, options['batch_size']):
+            archive([row['pk'] for row in batch])
+            moved += len(batch)
+            time.sleep(options['pause'])
+        self.stdout.write(self.style.SUCCESS(
+            f'В архив перенесено {moved} публикаций, '
+            f'{time.monotonic() - started:.1f} с.'
+        ))
@@ -0,0 +1,217 @@
+import asyncio
+import io
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from itertools import cycle, islice
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections
+from django.test import Client, override_settings
+
+from .benchmark_views import Command as BenchmarkViews
+from blog import benchmarks
+from blogicum.settings import BASE_DIR
+
+SERVERS = ('wsgi', 'asgi')
+URL_NAMES = (
+    'blog:index', 'blog:category_posts', 'blog:profile', 'blog:post_detail'
+)
+HOST = 'localhost'
+
+
+def wsgi_environ(path, cookie):
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SCRIPT_NAME': '',
+        'SERVER_NAME': HOST,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': HOST,
+        'HTTP_COOKIE': cookie,
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.url_scheme': 'http',
+        'wsgi.version': (1, 0),
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+
+
+def asgi_scope(path, cookie):
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', HOST.encode()), (b'cookie', cookie.encode())],
+        'server': (HOST, 80),
+        'client': ('127.0.0.1', 0),
+    }
+
+
+def run_wsgi(paths, cookie, concurrency, workers, delay):
+    """`concurrency` clients share `workers` sync workers; a worker stays
+    busy until its slow client has read the whole response."""
+    application = get_wsgi_application()
+    slots = threading.BoundedSemaphore(workers)
+    statuses = []
+
+    def start_response(status, headers, exc_info=None):
+        statuses.append(int(status.split()[0]))
+
+    def client(requests, timings):
+        for path in requests:
+            started = time.perf_counter()
+            with slots:
+                body = application(wsgi_environ(path, cookie), start_response)
+                try:
+                    for _ in body:
+                        pass
+                    time.sleep(delay)
+                finally:
+                    body.close()
+            timings.append(time.perf_counter() - started)
+        connections.close_all()
+
+    timings = []
+    threads = [
+        threading.Thread(
+            target=client, args=(islice(paths, index, None, concurrency),
+                                 timings))
+        for index in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return timings, statuses
+
+
+def run_asgi(paths, cookie, concurrency, delay):
+    """`concurrency` clients on one event loop; a slow client only delays
+    its own request."""
+    application = get_asgi_application()
+    statuses = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+        elif not message.get('more_body'):
+            await asyncio.sleep(delay)
+
+    async def client(requests, timings):
+        for path in requests:
+            started = time.perf_counter()
+            await application(asgi_scope(path, cookie), receive, send)
+            timings.append(time.perf_counter() - started)
+
+    async def main():
+        timings = []
+        await asyncio.gather(*(
+            client(islice(paths, index, None, concurrency), timings)
+            for index in range(concurrency)
+        ))
+        return timings
+
+    return asyncio.run(main()), statuses
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность и задержку WSGI и ASGI '
+            'на страницах ленты и публикации при медленных клиентах.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--server', choices=SERVERS,
+            help='Замерить один сервер в текущем процессе.')
+        parser.add_argument(
+            '--scale', choices=benchmarks.SCALES, default='1k')
+        parser.add_argument(
+            '--data-dir', default=str(BASE_DIR / 'benchmarks' / 'data'))
+        parser.add_argument('--requests', type=int, default=400)
+        parser.add_argument('--concurrency', type=int, default=64)
+        parser.add_argument(
+            '--workers', type=int, default=8,
+            help='Число синхронных воркеров WSGI.')
+        parser.add_argument(
+            '--client-delay', type=float, default=0.2,
+            help='Сколько секунд клиент читает ответ.')
+
+    def handle(self, *args, **options):
+        if options['server'] is None:
+            return self.compare(options)
+        BenchmarkViews(stdout=self.stdout).use_dataset(
+            options['scale'], options['data_dir'])
+        author, values = benchmarks.sample_kwargs()
+        client = Client()
+        client.force_login(author)
+        cookie = client.cookies[settings.SESSION_COOKIE_NAME]
+        cookie = f'{cookie.key}={cookie.value}'
+        urls = [url for name, url in benchmarks.named_urls(values)
+                if name in URL_NAMES]
+        paths = list(islice(cycle(urls), options['requests']))
+        connection.close()
+        # Diagnostics are sync-only and would measure themselves.
+        with override_settings(DEBUG=False, NPLUSONE_ENABLED=False,
+                               PROFILING_ENABLED=False):
+            self.measure(options, urls, cookie)
+            started = time.perf_counter()
+            timings, statuses = self.measure(options, paths, cookie)
+            elapsed = time.perf_counter() - started
+        self.report(options['server'], elapsed, timings, statuses)
+
+    def measure(self, options, paths, cookie):
+        if options['server'] == 'wsgi':
+            return run_wsgi(
+                paths, cookie, options['concurrency'], options['workers'],
+                options['client_delay'])
+        return run_asgi(
+            paths, cookie, options['concurrency'], options['client_delay'])
+
+    def report(self, server, elapsed, timings, statuses):
+        views = 'async' if settings.ASYNC_VIEWS else 'sync'
+        quantiles = statistics.quantiles(timings, n=20, method='inclusive')
+        errors = sum(status != 200 for status in statuses)
+        self.stdout.write(
+            f'{server} ({views} views): '
+            f'{len(timings) / elapsed:>8.1f} req/s '
+            f'p50 {statistics.median(timings) * 1000:>8.1f} ms '
+            f'p95 {quantiles[-1] * 1000:>8.1f} ms '
+            f'errors {errors}'
+        )
+
+    def compare(self, options):
+        """Run every server in its own process, the async views are
+        chosen when the URLconf is imported."""
+        forwarded = []
+        for option in ('scale', 'data_dir', 'requests', 'concurrency',
+                       'workers', 'client_delay'):
+            forwarded += [f'--{option.replace("_", "-")}',
+                          str(options[option])]
+        for server in SERVERS:
+            env = dict(
+                os.environ,
+                BLOGICUM_ASYNC_VIEWS='1' if server == 'asgi' else '0')
+            result = subprocess.run(
+                [sys.executable, str(BASE_DIR / 'manage.py'),
+                 'benchmark_servers', '--server', server, *forwarded],
+                env=env, stdout=subprocess.PIPE, text=True, check=True)
+            self.stdout.write(result.stdout, ending='')
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment
+
+from blog import benchmarks
+from blog.models import Post
+from blogicum.settings import BASE_DIR
+
+
+class Command(BaseCommand):
+    help = ('Замеряет число запросов, задержку и размер ответа всех '
+            'именованных адресов blog и pages на наборах данных разного '
+            'размера и сравнивает с базовой линией.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales', nargs='+', choices=benchmarks.SCALES,
+            default=list(benchmarks.SCALES))
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument(
+            '--data-dir', default=str(BASE_DIR / 'benchmarks' / 'data'),
+            help='Где хранить базы SQLite с наборами данных.')
+        parser.add_argument(
+            '--baseline',
+            default=str(BASE_DIR / 'benchmarks' / 'baseline.json'))
+        parser.add_argument('--update-baseline', action='store_true')
+        parser.add_argument(
+            '--no-latency', action='store_true',
+            help='Сравнивать только число запросов и размер ответа.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        baseline = benchmarks.load_baseline(options['baseline'])
+        original_name = connection.settings_dict['NAME']
+        problems = []
+        try:
+            for scale in options['scales']:
+                self.use_dataset(scale, options['data_dir'])
+                results = benchmarks.run(options['repeat'])
+                self.report(scale, results)
+                if options['update_baseline']:
+                    baseline[scale] = results
+                    continue
+                if scale not in baseline:
+                    self.stdout.write(self.style.WARNING(
+                        f'Для {scale} нет базовой линии, сравнение пропущено.'
+                    ))
+                problems += [
+                    f'[{scale}] {problem}'
+                    for problem in benchmarks.compare(
+                        results, baseline.get(scale, {}),
+                        check_latency=not options['no_latency'])
+                ]
+        finally:
+            connection.close()
+            connection.settings_dict['NAME'] = original_name
+        if options['update_baseline']:
+            benchmarks.save_baseline(options['baseline'], baseline)
+            self.stdout.write(
+                f'Базовая линия сохранена: {options["baseline"]}')
+        if problems:
+            raise CommandError('Регрессии:\n' + '\n'.join(problems))
+
+    def use_dataset(self, scale, data_dir):
+        path = Path(data_dir) / f'{scale}.sqlite3'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection.close()
+        connection.settings_dict['NAME'] = str(path)
+        call_command('migrate', verbosity=0)
+        if not Post.objects.exists():
+            self.stdout.write(f'Создаю набор данных {scale}...')
+            benchmarks.seed(benchmarks.SCALES[scale])
+
+    def report(self, scale, results):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{scale}:'))
+        for name, result in results.items():
+            self.stdout.write(
+                f'  {name:32} {result["status"]} '
+                f'{result["queries"]:>4} q '
+                f'p50 {result["p50_ms"]:>8.2f} ms '
+                f'p95 {result["p95_ms"]:>8.2f} ms '
+                f'warm p50 {result["warm_p50_ms"]:>8.2f} ms '
+                f'{result["bytes"]:>8} B'
+            )
@@ -0,0 +1,138 @@
+import csv
+import gzip
+import json
+from datetime import datetime, time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+from blog.models import (
+    ArchivedComment, ArchivedPost, Category, Comment, Location, Post, User
+)
+from blog.utils import iter_batches
+
+EXPORT_MODELS = {
+    'auth.user': (User, 'date_joined'),
+    'blog.category': (Category, 'created_at'),
+    'blog.location': (Location, 'created_at'),
+    'blog.post': (Post, 'created_at'),
+    'blog.comment': (Comment, 'created_at'),
+    'blog.archivedpost': (ArchivedPost, 'created_at'),
+    'blog.archivedcomment': (ArchivedComment, 'created_at'),
+}
+
+
+def parse_since(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f'Некорректная дата: {value}')
+        moment = datetime.combine(day, time.min)
+    return make_aware(moment) if is_naive(moment) else moment
+
+
+def iter_records(model, since_field, since, batch_size):
+    """Yield fixture-style records of `model` in keyset batches."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key
+    ]
+    m2m_fields = model._meta.many_to_many
+    # The base manager: soft deleted posts still own their comments.
+    queryset = model._base_manager.values(
+        'pk', *(f.attname for f in fields))
+    if since is not None:
+        queryset = queryset.filter(**{f'{since_field}__gte': since})
+    for batch in iter_batches(queryset, batch_size):
+        m2m_values = {
+            field.name: _m2m_values(field, [row['pk'] for row in batch])
+            for field in m2m_fields
+        }
+        for row in batch:
+            record = {field.name: row[field.attname] for field in fields}
+            for name, values in m2m_values.items():
+                record[name] = values.get(row['pk'], [])
+            yield row['pk'], record
+
+
+def _m2m_values(field, pks):
+    through = field.remote_field.through
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+    values = {}
+    rows = through.objects.filter(
+        **{f'{source}__in': pks}
+    ).values_list(f'{source}_id', f'{target}_id')
+    for source_pk, target_pk in rows:
+        values.setdefault(source_pk, []).append(target_pk)
+    return values
+
+
+class Command(BaseCommand):
+    help = ('Выгружает пользователей, категории, местоположения, посты '
+            'и комментарии, включая архивные, в JSONL или CSV по одному '
+            'файлу на модель.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=('jsonl', 'csv'), default='jsonl')
+        parser.add_argument('--output', default='export')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument(
+            '--since',
+            help='Выгрузить только записи, созданные начиная с этой даты.')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--models', nargs='+', choices=EXPORT_MODELS,
+            default=list(EXPORT_MODELS))
+
+    def handle(self, *args, **options):
+        since = options['since'] and parse_since(options['since'])
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+        for label in options['models']:
+            model, since_field = EXPORT_MODELS[label]
+            path = output / f'{label}.{options["format"]}'
+            if options['gzip']:
+                path = path.with_name(path.name + '.gz')
+            opener = gzip.open if options['gzip'] else open
+            with opener(path, 'wt', encoding='utf-8', newline='') as stream:
+                records = iter_records(
+                    model, since_field, since, options['batch_size'])
+                if options['format'] == 'csv':
+                    count = self.write_csv(stream, model, records)
+                else:
+                    count = self.write_jsonl(stream, label, records)
+            self.stdout.write(f'{label}: {count} -> {path}')
+
+    def write_jsonl(self, stream, label, records):
+        count = 0
+        for pk, fields in records:
+            stream.write(json.dumps(
+                {'model': label, 'pk': pk, 'fields': fields},
+                cls=DjangoJSONEncoder, ensure_ascii=False
+            ))
+            stream.write('\n')
+            count += 1
+        return count
+
+    def write_csv(self, stream, model, records):
+        names = [
+            field.name for field in model._meta.concrete_fields
+            if not field.primary_key
+        ] + [field.name for field in model._meta.many_to_many]
+        writer = csv.writer(stream)
+        writer.writerow(['pk', *names])
+        count = 0
+        for pk, fields in records:
+            writer.writerow([pk, *(
+                json.dumps(value) if isinstance(value, list) else
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in (fields[name] for name in names)
+            )])
+            count += 1
+        return count
@@ -0,0 +1,188 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import slugify
+from faker import Faker
+
+from blog.caching import bump_feed_version
+from blog.models import (
+    Category, Comment, FeedEntry, Location, Post, User
+)
+from blog.utils import raw_timestamps
+
+SENTENCE_POOL_SIZE = 5000
+HISTORY_DAYS = 5 * 365
+FUTURE_DAYS = 30
+# Large prime used to scatter skewed indexes so that "hot" objects
+# are spread over the whole table instead of being the oldest rows.
+SCATTER = 2_654_435_761
+
+
+class Generator:
+    """Seeded source of skewed choices and filler text."""
+
+    def __init__(self, seed, skew):
+        self.random = random.Random(seed)
+        self.skew = skew
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(seed)
+        self.sentences = [
+            self.faker.sentence(nb_words=12)
+            for _ in range(SENTENCE_POOL_SIZE)
+        ]
+
+    def skewed(self, first_pk, count):
+        """Pick a primary key so that few objects get most of the picks."""
+        index = int(count * self.random.random() ** self.skew)
+        return first_pk + index * SCATTER % count
+
+    def text(self, min_sentences, max_sentences):
+        return ' '.join(self.random.choices(
+            self.sentences,
+            k=self.random.randint(min_sentences, max_sentences)
+        ))
+
+    def moment(self, now, days_back, days_forward=0):
+        seconds = self.random.randint(
+            -days_back * 86400, days_forward * 86400)
+        return now + timedelta(seconds=seconds)
+
+
+def next_pk(model):
+    return (model._base_manager.aggregate(pk=Max('pk'))['pk'] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = ('Создаёт воспроизводимый синтетический набор данных '
+            'для нагрузочного тестирования.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=50000)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--skew', type=float, default=3.0,
+            help='Степень перекоса: авторы, категории и обсуждаемые посты '
+                 'выбираются по степенному закону.')
+        parser.add_argument('--future-share', type=float, default=0.05)
+        parser.add_argument('--unpublished-share', type=float, default=0.02)
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.generator = Generator(options['seed'], options['skew'])
+        self.now = timezone.now()
+        started = time.monotonic()
+        with raw_timestamps([Category, Location, Post, Comment]):
+            users = self.create(User, options['users'], self.build_user)
+            categories = self.create(
+                Category, options['categories'], self.build_category)
+            locations = self.create(
+                Location, options['locations'], self.build_location)
+            self.pools = {
+                'users': users, 'categories': categories,
+                'locations': locations,
+            }
+            posts = self.create(Post, options['posts'], self.build_post)
+            self.pools['posts'] = posts
+            self.create(Comment, options['comments'], self.build_comment)
+        FeedEntry.objects.rebuild()
+        bump_feed_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово за {time.monotonic() - started:.1f} с.'
+        ))
+
+    def create(self, model, count, build):
+        """Insert `count` objects in batches; return (first pk, count)."""
+        first_pk = next_pk(model)
+        batch_size = self.options['batch_size']
+        for start in range(0, count, batch_size):
+            objects = [
+                build(first_pk + index)
+                for index in range(start, min(start + batch_size, count))
+            ]
+            with transaction.atomic():
+                model._base_manager.bulk_create(objects)
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: '
+                f'{start + len(objects)}/{count}', ending='\r')
+        self.stdout.write('')
+        return first_pk, count
+
+    def pick(self, pool):
+        first_pk, count = self.pools[pool]
+        return self.generator.skewed(first_pk, count) if count else None
+
+    def build_user(self, pk):
+        if not hasattr(self, 'password'):
+            self.password = make_password('password')
+        faker = self.generator.faker
+        return User(
+            pk=pk,
+            username=f'{faker.user_name()}{pk}',
+            first_name=faker.first_name(),
+            last_name=faker.last_name(),
+            email=f'user{pk}@example.com',
+            password=self.password,
+            date_joined=self.generator.moment(self.now, HISTORY_DAYS),
+        )
+
+    def build_category(self, pk):
+        title = self.generator.faker.word().capitalize()
+        return Category(
+            pk=pk,
+            title=title,
+            description=self.generator.text(1, 3),
+            slug=f'{slugify(title) or "category"}-{pk}',
+            is_published=self.generator.random.random() > 0.1,
+            created_at=self.generator.moment(self.now, HISTORY_DAYS),
+        )
+
+    def build_location(self, pk):
+        return Location(
+            pk=pk,
+            name=self.generator.faker.city(),
+            is_published=self.generator.random.random() > 0.1,
+            created_at=self.generator.moment(self.now, HISTORY_DAYS),
+        )
+
+    def build_post(self, pk):
+        generator = self.generator
+        if generator.random.random() < self.options['future_share']:
+            pub_date = generator.moment(self.now, 0, FUTURE_DAYS)
+        else:
+            pub_date = generator.moment(self.now, HISTORY_DAYS)
+        return Post(
+            pk=pk,
+            title=generator.faker.sentence(nb_words=5)[:256],
+            text=generator.text(2, 30),
+            pub_date=pub_date,
+            author_id=self.pick('users'),
+            category_id=self.pick('categories'),
+            location_id=(
+                self.pick('locations')
+                if generator.random.random() > 0.3 else None
+            ),
+            is_published=(
+                generator.random.random() >= self.options['unpublished_share']
+            ),
+            created_at=min(pub_date, self.now),
+        )
+
+    def build_comment(self, pk):
+        return Comment(
+            pk=pk,
+            text=self.generator.text(1, 4),
+            author_id=self.pick('users'),
+            post_id=self.pick('posts'),
+            created_at=self.generator.moment(self.now, HISTORY_DAYS),
+        )
@@ -0,0 +1,221 @@
+import gzip
+import json
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .export_data import EXPORT_MODELS
+from blog.caching import bump_feed_version
+from blog.models import FeedEntry
+from blog.utils import raw_timestamps
+
+READ_CHUNK_SIZE = 1 << 16
+SEPARATORS = re.compile(r'[\s,]*')
+
+
+def iter_json_array(stream):
+    """Yield the items of a top-level JSON array without reading
+    the whole document."""
+    decoder = json.JSONDecoder()
+    buffer = stream.read(READ_CHUNK_SIZE).lstrip()
+    if not buffer.startswith('['):
+        raise CommandError('Фикстура должна быть JSON-массивом.')
+    pos = 1
+    eof = False
+    while True:
+        pos = SEPARATORS.match(buffer, pos).end()
+        if pos < len(buffer) and buffer[pos] == ']':
+            return
+        try:
+            item, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise CommandError('Фикстура повреждена или обрезана.')
+            chunk = stream.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        yield item
+
+
+def iter_records(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as stream:
+        if '.jsonl' in path:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(stream)
+
+
+def export_order(path):
+    """Position of an `export_data` file in `EXPORT_MODELS`, which lists
+    the models in foreign key order; other files go last."""
+    name = Path(path).name
+    for position, label in enumerate(EXPORT_MODELS):
+        if name.startswith(f'{label}.'):
+            return position
+    return len(EXPORT_MODELS)
+
+
+@contextmanager
+def deferred_indexes(connection, enabled=True):
+    """Yield `defer(table)`, which drops the secondary indexes of `table`
+    on SQLite until the import ends; unique indexes are kept as they
+    enforce data. Only the tables actually loaded are touched."""
+    dropped = {}
+
+    def defer(table):
+        if not enabled or connection.vendor != 'sqlite' or table in dropped:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                "AND sql IS NOT NULL AND tbl_name = %s", [table]
+            )
+            dropped[table] = [
+                (name, sql) for name, sql in cursor.fetchall()
+                if not sql.upper().startswith('CREATE UNIQUE')
+            ]
+            for name, _ in dropped[table]:
+                cursor.execute(f'DROP INDEX "{name}"')
+
+    try:
+        yield defer
+    finally:
+        with connection.cursor() as cursor:
+            for indexes in dropped.values():
+                for _, sql in indexes:
+                    cursor.execute(sql)
+
+
+class Command(BaseCommand):
+    help = ('Быстро загружает фикстуры (JSON-массив как db.json или JSONL '
+            'из export_data) через bulk_create.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--exclude', nargs='*', default=[],
+            help='Пропустить приложения или модели (app_label[.Model]).')
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Пропускать записи с уже существующими ключами.')
+        parser.add_argument(
+            '--keep-indexes', action='store_true',
+            help='Не перестраивать индексы SQLite после загрузки.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        self.using = options['database']
+        self.verbosity = options['verbosity']
+        self.batch_size = options['batch_size']
+        self.ignore_conflicts = options['ignore_conflicts']
+        self.exclude = {label.lower() for label in options['exclude']}
+        connection = connections[self.using]
+        models = [
+            model for model in apps.get_models()
+            if not self.is_excluded(model._meta.label_lower)
+        ]
+        self.counts = {}
+        started = time.monotonic()
+        with connection.constraint_checks_disabled(), \
+                raw_timestamps(models), \
+                deferred_indexes(
+                    connection, not options['keep_indexes']) as defer:
+            self.defer_indexes = defer
+            for path in sorted(options['paths'], key=export_order):
+                self.load(path)
+        loaded = [apps.get_model(label) for label in self.counts]
+        connection.check_constraints(
+            table_names=[model._meta.db_table for model in loaded]
+        )
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), loaded)
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+        FeedEntry.objects.using(self.using).rebuild()
+        bump_feed_version()
+
+        elapsed = time.monotonic() - started
+        total = sum(self.counts.values())
+        for label, count in self.counts.items():
+            self.stdout.write(f'{label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {total} объектов за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-6):.0f} объектов/с).'
+        ))
+
+    def is_excluded(self, label):
+        return label in self.exclude or label.split('.')[0] in self.exclude
+
+    def load(self, path):
+        pending = {}
+        for record in iter_records(path):
+            label = record['model'].lower()
+            if self.is_excluded(label):
+                continue
+            batch = pending.setdefault(label, [])
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                self.flush(label, batch)
+                pending[label] = []
+        for label, batch in pending.items():
+            if batch:
+                self.flush(label, batch)
+
+    def flush(self, label, records):
+        try:
+            model = apps.get_model(label)
+        except LookupError:
+            raise CommandError(f'Неизвестная модель: {label}')
+        objects, m2m = self.build(model, records)
+        if model._meta.managed:
+            self.defer_indexes(model._meta.db_table)
+        for field in m2m:
+            self.defer_indexes(field.remote_field.through._meta.db_table)
+        with transaction.atomic(using=self.using):
+            model._base_manager.using(self.using).bulk_create(
+                objects, ignore_conflicts=self.ignore_conflicts
+            )
+            for field, pairs in m2m.items():
+                through = field.remote_field.through
+                source = f'{field.m2m_field_name()}_id'
+                target = f'{field.m2m_reverse_field_name()}_id'
+                through._base_manager.using(self.using).bulk_create(
+                    [through(**{source: pk, target: target_pk})
+                     for pk, target_pk in pairs],
+                    ignore_conflicts=True
+                )
+        self.counts[label] = self.counts.get(label, 0) + len(objects)
+        if self.verbosity > 1:
+            self.stdout.write(f'{label}: +{len(objects)}')
+
+    def build(self, model, records):
+        """Unsaved objects of `records` and m2m pairs by field."""
+        objects = []
+        m2m = {}
+        for record in records:
+            obj = model(pk=record.get('pk'))
+            for name, value in record['fields'].items():
+                field = model._meta.get_field(name)
+                if field.many_to_many:
+                    m2m.setdefault(field, []).extend(
+                        (obj.pk, target) for target in value
+                    )
+                elif field.is_relation:
+                    setattr(obj, field.attname, value)
+                else:
+                    setattr(obj, field.attname, field.to_python(value))
+            objects.append(obj)
+        return objects, m2m
@@ -0,0 +1,63 @@
+import heapq
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Показывает отложенные публикации в лентах в момент '
+            'наступления pub_date.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Опубликовать наступившие и выйти (для cron).')
+        parser.add_argument(
+            '--reload-interval', type=float, default=60,
+            help='Как часто перечитывать расписание из базы, секунды.')
+        parser.add_argument(
+            '--limit', type=int, default=1000,
+            help='Сколько ближайших публикаций держать в очереди.')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        if options['once']:
+            self.log(Post.objects.publish_due())
+            return
+        while True:
+            reload_at = time.monotonic() + options['reload_interval']
+            # Catches posts saved since the last reload with a date before
+            # the next one, and the ones beyond `--limit` that are due.
+            self.log(Post.objects.publish_due())
+            heap = self.load(options['limit'])
+            while time.monotonic() < reload_at:
+                wait = reload_at - time.monotonic()
+                if heap:
+                    delay = (heap[0][0] - timezone.now()).total_seconds()
+                    wait = min(wait, delay)
+                time.sleep(max(wait, 0))
+                due = []
+                now = timezone.now()
+                while heap and heap[0][0] <= now:
+                    due.append(heapq.heappop(heap)[1])
+                if due:
+                    self.log(
+                        Post.objects.filter(pk__in=due).publish_due())
+
+    def load(self, limit):
+        """Min-heap of (pub_date, pk) of the nearest scheduled posts."""
+        heap = list(Post.objects.filter(
+            is_visible=False,
+            pub_date__gt=timezone.now(),
+            is_published=True,
+            category__is_published=True,
+        ).order_by('pub_date').values_list('pub_date', 'pk')[:limit])
+        heapq.heapify(heap)
+        return heap
+
+    def log(self, changed):
+        if changed and self.verbosity:
+            self.stdout.write(f'Обновлена видимость {changed} публикаций.')
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.deletion import purge
+from blog.models import Post
+from blog.utils import iter_batches
+
+
+class Command(BaseCommand):
+    help = ('Стирает удалённые публикации: комментарии небольшими '
+            'транзакциями, затем саму публикацию и её изображение.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько комментариев удалять в одной транзакции.')
+        parser.add_argument(
+            '--pause', type=float, default=0.05,
+            help='Пауза между транзакциями, чтобы не задерживать '
+            'запись с сайта, секунды.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        posts = Post.all_objects.filter(deleted_at__isnull=False)
+        purged = comments = 0
+        # Keyset batches: each one is a fresh query over the rows left.
+        for batch in iter_batches(posts, options['batch_size']):
+            for post in batch:
+                comments += purge(
+                    post, options['batch_size'], options['pause'])
+                purged += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Стёрто {purged} публикаций и {comments} комментариев, '
+            f'{time.monotonic() - started:.1f} с.'
+        ))
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.caching import bump_feed_version
+from blog.models import FeedEntry
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает видимость публикаций и заново заполняет '
+            'таблицу ленты.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        FeedEntry.objects.rebuild()
+        bump_feed_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'В ленте {FeedEntry.objects.count()} записей, '
+            f'{time.monotonic() - started:.1f} с.'
+        ))
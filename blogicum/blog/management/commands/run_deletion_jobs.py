@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.deletion import run_deletion_job
+from blog.models import DeletionJob
+
+
+class Command(BaseCommand):
+    help = ('Удаляет отключённых пользователей со всеми публикациями и '
+            'комментариями небольшими транзакциями; прерванные задачи '
+            'продолжаются с места остановки.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько комментариев удалять в одной транзакции.')
+        parser.add_argument(
+            '--pause', type=float, default=0.05,
+            help='Пауза между транзакциями, чтобы не задерживать '
+            'запись с сайта, секунды.')
+
+    def handle(self, *args, **options):
+        jobs = DeletionJob.objects.exclude(
+            status=DeletionJob.DONE
+        ).order_by('created_at')
+        for job in jobs:
+            started = time.monotonic()
+            run_deletion_job(job, options['batch_size'], options['pause'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{job.username}: удалено {job.deleted} объектов, '
+                f'{time.monotonic() - started:.1f} с.'
+            ))
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:00
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_is_visible(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.filter(
+        pub_date__lte=timezone.now(),
+        is_published=True,
+        category__is_published=True
+    ).update(is_visible=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_alter_comment_post'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='is_visible',
+            field=models.BooleanField(default=False, editable=False, help_text='Опубликовано, категория опубликована и время публикации наступило; ставит publish_scheduled.', verbose_name='Показывается в лентах'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['is_visible', 'pub_date'], name='post_visible_pub_date_idx'),
+        ),
+        migrations.RunPython(fill_is_visible, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+FILL_FEED = '''
+INSERT INTO blog_feedentry
+    (post_id, pub_date, category_slug, author_username, comment_count)
+SELECT post.id, post.pub_date, category.slug, author.username,
+    (SELECT COUNT(*) FROM blog_comment WHERE post_id = post.id)
+FROM blog_post post
+JOIN blog_category category ON category.id = post.category_id
+JOIN auth_user author ON author.id = post.author_id
+WHERE post.is_visible
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('category_slug', models.SlugField(verbose_name='Категория')),
+                ('author_username', models.CharField(max_length=150, verbose_name='Автор')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Лента',
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_visible_pub_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['-pub_date'], name='post_visible_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_published', True), ('is_visible', False)), fields=['pub_date'], name='post_scheduled_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['-pub_date', '-post'], name='feed_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['category_slug', '-pub_date', '-post'], name='feed_category_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['author_username'], name='feed_author_idx'),
+        ),
+        migrations.RunSQL(FILL_FEED, migrations.RunSQL.noop),
+    ]
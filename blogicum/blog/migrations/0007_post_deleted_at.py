@@ -0,0 +1,22 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Удалённую публикацию не видно нигде, purge_deleted позже стирает её вместе с комментариями.', null=True, verbose_name='Удалено'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='post_deleted_idx'),
+        ),
+    ]
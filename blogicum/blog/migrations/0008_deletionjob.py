@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0007_post_deleted_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=150, verbose_name='Имя пользователя')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('done', 'Завершено')], default='pending', max_length=16, verbose_name='Состояние')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Всего объектов')),
+                ('deleted', models.PositiveIntegerField(default=0, verbose_name='Удалено объектов')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Завершено')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deletion_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'удаление пользователя',
+                'verbose_name_plural': 'Удаление пользователей',
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
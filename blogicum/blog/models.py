@@ -1,7 +1,10 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count
 from django.urls import reverse
+from django.utils import timezone
 
+from .caching import bump_feed_version
 from blogicum.settings import POSTS_IN_PAGE
 
 
@@ -39,6 +42,9 @@ class Category(models.Model):
     class Meta:
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            models.Index(fields=['title'], name='category_title_idx'),
+        ]
 
     def __str__(self):
         return self.title[:POSTS_IN_PAGE]
@@ -65,9 +71,58 @@ class Location(models.Model):
     class Meta:
         verbose_name = 'местоположение'
         verbose_name_plural = 'Местоположения'
+        indexes = [
+            models.Index(fields=['name'], name='location_name_idx'),
+        ]
 
+    def __str__(self):
+        return self.name
+
+
+class PostQuerySet(models.QuerySet):
+
+    def with_related(self):
+        return self.select_related('author', 'category', 'location')
+
+    def with_comment_count(self):
+        return self.annotate(
+            comment_count=Count('comments')
+        ).order_by('-pub_date')
+
+    def published(self):
+        return self.filter(is_visible=True)
+
+    def refresh_visibility(self):
+        """Recompute `is_visible` of the posts, return how many changed."""
+        visible = self.filter(
+            pub_date__lte=timezone.now(),
+            is_published=True,
+            category__is_published=True
+        )
+        hidden = self.filter(is_visible=True).exclude(
+            pk__in=visible.values('pk')
+        ).update(is_visible=False)
+        shown = visible.filter(is_visible=False).update(is_visible=True)
+        FeedEntry.objects.using(self.db).sync(self)
+        return hidden + shown
+
+    def publish_due(self):
+        """Show the posts whose time has come, hide the ones rescheduled
+        to the future; return how many changed."""
+        changed = self.refresh_visibility()
+        if changed:
+            bump_feed_version()
+        return changed
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
+    """Posts that are not deleted."""
 
-class Post(models.Model):
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at=None)
+
+
+class BasePost(models.Model):
     title = models.CharField(
         max_length=256,
         blank=True,
@@ -121,6 +176,7 @@ class Post(models.Model):
     )
 
     class Meta:
+        abstract = True
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
 
@@ -131,7 +187,72 @@ class Post(models.Model):
         return reverse('blog:post_detail', kwargs={'pk': self.pk})
 
 
-class Comment(models.Model):
+class Post(BasePost):
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Показывается в лентах',
+        help_text='Опубликовано, категория опубликована и время '
+        'публикации наступило; ставит publish_scheduled.'
+    )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Удалено',
+        help_text='Удалённую публикацию не видно нигде, purge_deleted '
+        'позже стирает её вместе с комментариями.'
+    )
+
+    objects = PostManager()
+    all_objects = PostQuerySet.as_manager()
+
+    class Meta(BasePost.Meta):
+        # Partial indexes: SQLite compares booleans as a bare column,
+        # which an index on (is_visible, pub_date) can't serve.
+        indexes = [
+            models.Index(
+                fields=['-pub_date'],
+                condition=models.Q(is_visible=True),
+                name='post_visible_pub_date_idx'
+            ),
+            models.Index(
+                fields=['pub_date'],
+                condition=models.Q(is_visible=False, is_published=True),
+                name='post_scheduled_pub_date_idx'
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(deleted_at__isnull=False),
+                name='post_deleted_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Like the database, accept strings and naive datetimes.
+        self.pub_date = self._meta.get_field('pub_date').get_prep_value(
+            self.pub_date)
+        self.is_visible = bool(
+            self.is_published
+            and self.pub_date is not None
+            and self.pub_date <= timezone.now()
+            and self.category_id is not None
+            and self.category.is_published
+            and self.deleted_at is None
+        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'is_visible'}
+        super().save(*args, **kwargs)
+
+    def soft_delete(self):
+        """Hide the post everywhere at once; `purge_deleted` removes it
+        with its comments and image later."""
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at'])
+
+
+class BaseComment(models.Model):
     text = models.TextField('Текст комментария')
     author = models.ForeignKey(
         User,
@@ -139,6 +260,16 @@ class Comment(models.Model):
         blank=True,
         verbose_name='Автор комментария'
     )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        abstract = True
+        ordering = ('created_at',)
+        verbose_name = 'комментарий'
+        verbose_name_plural = 'Комментарии'
+
+
+class Comment(BaseComment):
     post = models.ForeignKey(
         Post,
         on_delete=models.CASCADE,
@@ -146,9 +277,146 @@ class Comment(models.Model):
         null=True,
         related_name='comments',
     )
-    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta(BaseComment.Meta):
+        pass
+
+
+class ArchivedPost(BasePost):
+    """A post moved out of `Post` by `archive_posts`, read-only."""
+
+    class Meta(BasePost.Meta):
+        verbose_name = 'архивная публикация'
+        verbose_name_plural = 'Архив публикаций'
+
+
+class ArchivedComment(BaseComment):
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments',
+    )
+
+    class Meta(BaseComment.Meta):
+        verbose_name = 'архивный комментарий'
+        verbose_name_plural = 'Архив комментариев'
+
+
+class FeedEntryQuerySet(models.QuerySet):
+
+    def for_posts(self, posts, batch_size=1000):
+        """Yield unsaved entries of the visible `posts` in batches."""
+        from .utils import iter_batches
+        rows = posts.filter(is_visible=True).values(
+            'pk', 'pub_date', 'category__slug', 'author__username'
+        ).annotate(comment_count=Count('comments'))
+        for batch in iter_batches(rows, batch_size):
+            yield [
+                FeedEntry(
+                    post_id=row['pk'],
+                    pub_date=row['pub_date'],
+                    category_slug=row['category__slug'],
+                    author_username=row['author__username'],
+                    comment_count=row['comment_count'],
+                )
+                for row in batch
+            ]
+
+    def sync(self, posts):
+        """Drop the entries of hidden `posts`, add the missing ones."""
+        self.filter(post__in=posts.filter(is_visible=False)).delete()
+        for entries in self.for_posts(
+                posts.filter(feed_entry__isnull=True)):
+            self.bulk_create(entries)
+
+    def refresh(self, posts):
+        """Rewrite the entries of `posts` from scratch."""
+        with transaction.atomic(using=self.db):
+            self.filter(post__in=posts).delete()
+            for entries in self.for_posts(posts):
+                self.bulk_create(entries)
+
+    def rebuild(self):
+        """Recompute visibility of all posts and refill the table."""
+        with transaction.atomic(using=self.db):
+            self.all().delete()
+            Post.objects.using(self.db).refresh_visibility()
+
+
+class FeedEntry(models.Model):
+    """A visible post with what the feeds sort and filter by,
+    maintained by signals in `blog.signals`."""
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry',
+        verbose_name='Публикация'
+    )
+    pub_date = models.DateTimeField('Дата и время публикации')
+    category_slug = models.SlugField('Категория')
+    author_username = models.CharField('Автор', max_length=150)
+    comment_count = models.PositiveIntegerField(
+        'Комментариев', default=0
+    )
+
+    objects = FeedEntryQuerySet.as_manager()
 
     class Meta:
-        ordering = ('created_at',)
-        verbose_name = 'комментарий'
-        verbose_name_plural = 'Комментарии'
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Лента'
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-post'],
+                name='feed_pub_date_idx'
+            ),
+            models.Index(
+                fields=['category_slug', '-pub_date', '-post'],
+                name='feed_category_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author_username'],
+                name='feed_author_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return str(self.post_id)
+
+
+class DeletionJob(models.Model):
+    """Removal of a deactivated user with everything they wrote, done in
+    batches by `run_deletion_jobs` and safe to resume."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    STATUSES = [
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Завершено'),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='deletion_jobs',
+        verbose_name='Пользователь'
+    )
+    username = models.CharField('Имя пользователя', max_length=150)
+    status = models.CharField(
+        'Состояние', max_length=16, choices=STATUSES, default=PENDING
+    )
+    total = models.PositiveIntegerField('Всего объектов', default=0)
+    deleted = models.PositiveIntegerField('Удалено объектов', default=0)
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    finished_at = models.DateTimeField('Завершено', null=True, blank=True)
+
+    class Meta:
+        ordering = ('-created_at',)
+        verbose_name = 'удаление пользователя'
+        verbose_name_plural = 'Удаление пользователей'
+
+    def __str__(self):
+        return self.username
@@ -0,0 +1,73 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .caching import bump_feed_version
+from .models import Category, Comment, FeedEntry, Location, Post, User
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_feeds(sender, **kwargs):
+    bump_feed_version()
+
+
+@receiver(post_save, sender=Post)
+def refresh_feed_entry(sender, instance, **kwargs):
+    FeedEntry.objects.refresh(Post.all_objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_posts(sender, instance, **kwargs):
+    Post.objects.filter(category=instance).refresh_visibility()
+    FeedEntry.objects.filter(post__category=instance).exclude(
+        category_slug=instance.slug
+    ).update(category_slug=instance.slug)
+
+
+@receiver(post_delete, sender=Category)
+def hide_orphaned_posts(sender, **kwargs):
+    # Deleting a category has set `category` of its posts to NULL.
+    Post.objects.filter(category=None).refresh_visibility()
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, **kwargs):
+    if created:
+        FeedEntry.objects.filter(post_id=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    FeedEntry.objects.filter(post_id=instance.post_id).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or (
+            update_fields is not None and 'username' not in update_fields):
+        return
+    instance._saved_username = User.objects.filter(
+        pk=instance.pk).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def rename_author(sender, instance, update_fields=None, **kwargs):
+    saved = instance.__dict__.pop('_saved_username', instance.username)
+    if saved == instance.username:
+        return
+    # Cached pages and cards link to the profile by the old username.
+    bump_feed_version()
+    FeedEntry.objects.filter(post__author=instance).exclude(
+        author_username=instance.username
+    ).update(author_username=instance.username)
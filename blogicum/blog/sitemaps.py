@@ -0,0 +1,101 @@
+from django.db.models import Max
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+
+from .models import ArchivedPost, Category, Post, User
+from blogicum.settings import SITEMAP_CHUNK_SIZE
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+ITERATOR_CHUNK_SIZE = 2000
+
+
+def _post_urls(lo, hi):
+    rows = Post.objects.published().filter(
+        pk__gte=lo, pk__lt=hi
+    ).order_by('pk').values_list('pk', 'pub_date')
+    for pk, pub_date in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield reverse('blog:post_detail', kwargs={'pk': pk}), pub_date
+
+
+def _archived_post_urls(lo, hi):
+    # Archived posts keep their URLs, see `PostDetailView.get_object`.
+    rows = ArchivedPost.objects.filter(
+        is_published=True, category__is_published=True,
+        pub_date__lte=timezone.now(), author__is_active=True,
+        pk__gte=lo, pk__lt=hi
+    ).order_by('pk').values_list('pk', 'pub_date')
+    for pk, pub_date in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield reverse('blog:post_detail', kwargs={'pk': pk}), pub_date
+
+
+def _category_urls(lo, hi):
+    rows = Category.objects.filter(
+        is_published=True, pk__gte=lo, pk__lt=hi
+    ).order_by('pk').values_list('slug', 'created_at')
+    for slug, created_at in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield reverse('blog:category_posts', args=[slug]), created_at
+
+
+def _profile_urls(lo, hi):
+    rows = User.objects.filter(
+        is_active=True, pk__gte=lo, pk__lt=hi
+    ).order_by('pk').values_list('username', flat=True)
+    for username in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield reverse('blog:profile', args=[username]), None
+
+
+SECTIONS = {
+    'posts': (Post, _post_urls),
+    'archive': (ArchivedPost, _archived_post_urls),
+    'categories': (Category, _category_urls),
+    'profiles': (User, _profile_urls),
+}
+
+
+def _stream(tag, entries):
+    yield XML_HEADER
+    yield f'<{tag} xmlns="{XMLNS}">\n'
+    yield from entries
+    yield f'</{tag}>\n'
+
+
+def _url_entries(base_url, urls):
+    for path, lastmod in urls:
+        entry = f'<url><loc>{escape(base_url + path)}</loc>'
+        if lastmod is not None:
+            entry += f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+        yield entry + '</url>\n'
+
+
+def sitemap_index(request):
+    """Sitemap index: one page per `SITEMAP_CHUNK_SIZE` primary keys."""
+    def entries():
+        for section, (model, _) in SECTIONS.items():
+            max_pk = model.objects.aggregate(max_pk=Max('pk'))['max_pk']
+            for page in range((max_pk or 0) // SITEMAP_CHUNK_SIZE + 1):
+                loc = request.build_absolute_uri(reverse(
+                    'blog:sitemap_section', args=[section, page]
+                ))
+                yield f'<sitemap><loc>{escape(loc)}</loc></sitemap>\n'
+
+    return StreamingHttpResponse(
+        _stream('sitemapindex', entries()), content_type='application/xml'
+    )
+
+
+def sitemap_section(request, section, page):
+    """Sitemap page with the objects of `section` in a primary key range."""
+    if section not in SECTIONS:
+        raise Http404
+    _, urls = SECTIONS[section]
+    lo = page * SITEMAP_CHUNK_SIZE
+    base_url = request.build_absolute_uri('/')[:-1]
+    return StreamingHttpResponse(
+        _stream('urlset', _url_entries(
+            base_url, urls(lo, lo + SITEMAP_CHUNK_SIZE)
+        )),
+        content_type='application/xml'
+    )
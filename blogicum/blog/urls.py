@@ -1,24 +1,37 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import api, async_views, feeds, sitemaps, views
+from .caching import cached_view
 
 app_name = 'blog'
 
+if settings.ASYNC_VIEWS:
+    index = async_views.index
+    post_detail = async_views.post_detail
+    category_posts = async_views.category_posts
+    profile = async_views.profile
+else:
+    index = views.index
+    post_detail = views.PostDetailView.as_view()
+    category_posts = views.category_posts
+    profile = views.ProfileListView.as_view()
+
 urlpatterns = [
     path('',
-         views.index,
+         index,
          name='index'),
     path('posts/<int:pk>/',
-         views.PostDetailView.as_view(),
+         post_detail,
          name='post_detail'),
     path('category/<slug:category_slug>/',
-         views.category_posts,
+         category_posts,
          name='category_posts'),
     path('profile/edit/',
          views.ProfileUpdateView.as_view(),
          name='edit_profile'),
     path('profile/<username>/',
-         views.ProfileListView.as_view(),
+         profile,
          name='profile'),
     path('posts/create/',
          views.PostCreateView.as_view(),
@@ -38,4 +51,46 @@ urlpatterns = [
     path('posts/<int:pk>/delete_comment/<int:comment_id>/',
          views.CommentDeleteView.as_view(),
          name='delete_comment'),
+    path('feed/rss/',
+         cached_view(feeds.LatestPostsFeed()),
+         name='feed_rss'),
+    path('feed/atom/',
+         cached_view(feeds.LatestPostsAtomFeed()),
+         name='feed_atom'),
+    path('category/<slug:category_slug>/rss/',
+         cached_view(feeds.CategoryPostsFeed()),
+         name='category_rss'),
+    path('category/<slug:category_slug>/atom/',
+         cached_view(feeds.CategoryPostsAtomFeed()),
+         name='category_atom'),
+    path('profile/<username>/rss/',
+         cached_view(feeds.AuthorPostsFeed()),
+         name='profile_rss'),
+    path('profile/<username>/atom/',
+         cached_view(feeds.AuthorPostsAtomFeed()),
+         name='profile_atom'),
+    path('sitemap.xml',
+         cached_view(sitemaps.sitemap_index),
+         name='sitemap'),
+    path('sitemap-<slug:section>-<int:page>.xml',
+         cached_view(sitemaps.sitemap_section),
+         name='sitemap_section'),
+    path('api/posts/',
+         cached_view(api.post_list, api.QUERY_PARAMS),
+         name='api_post_list'),
+    path('api/posts/<int:pk>/',
+         cached_view(api.post_detail, api.QUERY_PARAMS),
+         name='api_post_detail'),
+    path('api/posts/<int:pk>/comments/',
+         cached_view(api.comment_list, api.QUERY_PARAMS),
+         name='api_comment_list'),
+    path('api/category/<slug:category_slug>/posts/',
+         cached_view(api.category_post_list, api.QUERY_PARAMS),
+         name='api_category_post_list'),
+    path('api/profile/<username>/posts/',
+         cached_view(api.profile_post_list, api.QUERY_PARAMS),
+         name='api_profile_post_list'),
+    path('api/autocomplete/<slug:field>/',
+         api.autocomplete,
+         name='api_autocomplete'),
 ]
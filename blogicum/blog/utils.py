@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+
+from django.db.models import Q
+
+
+def iter_batches(queryset, batch_size):
+    """Yield lists of objects or `.values()` rows (which must include `pk`)
+    in primary key order, paging by key instead of OFFSET."""
+    last_pk = None
+    while True:
+        batch = queryset.order_by('pk')
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        batch = list(batch[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last = batch[-1]
+        last_pk = last['pk'] if isinstance(last, dict) else last.pk
+
+
+@contextmanager
+def raw_timestamps(models):
+    """Keep explicitly set values of `auto_now`/`auto_now_add` fields."""
+    patched = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(
+                    field, 'auto_now_add', False):
+                patched.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in patched:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def prefix_search(queryset, field, prefix):
+    """Filter `queryset` to rows whose `field` starts with `prefix`.
+
+    SQLite's LIKE is case-insensitive and can't use a regular index, so
+    the lookup is a range per spelling: as typed, lower case and
+    capitalized.
+    """
+    condition = Q()
+    for variant in {prefix, prefix.lower(), prefix.capitalize()}:
+        condition |= Q(**{
+            f'{field}__gte': variant,
+            f'{field}__lt': variant + '\U0010ffff',
+        })
+    return queryset.filter(condition)
@@ -1,72 +1,118 @@
 from django.core.paginator import Paginator
-from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import Count
+from django.http import Http404
+from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import get_object_or_404, render, redirect
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views.generic import (
     CreateView, DeleteView, ListView, UpdateView, DetailView
 )
 
-from .models import Category, Comment, Post, User
-from .forms import CommentForm, PostForm
+from .archive import ChainedPosts
+from .models import (
+    ArchivedPost, Category, Comment, FeedEntry, Post, User
+)
+from .forms import CommentForm, PostForm, ProfileForm
 from blogicum.settings import POSTS_IN_PAGE
+from core.replicas import replica_reads
+from core.writes import SerializedWriteMixin, serialized_write
+
+
+def feed_page(request, entries):
+    """Page of a `FeedEntry` queryset as posts with `comment_count`."""
+    entries = entries.select_related(
+        'post__author', 'post__category', 'post__location'
+    ).order_by('-pub_date', '-post')
+    page_obj = Paginator(entries, POSTS_IN_PAGE).get_page(
+        request.GET.get('page')
+    )
+    posts = []
+    for entry in page_obj:
+        entry.post.comment_count = entry.comment_count
+        posts.append(entry.post)
+    page_obj.object_list = posts
+    return page_obj
 
 
+def archived_posts():
+    # Hot posts of a user scheduled for deletion are soft deleted at once,
+    # archived ones wait for the job.
+    return ArchivedPost.objects.select_related(
+        'author', 'category', 'location'
+    ).filter(author__is_active=True)
+
+
+@replica_reads
 def index(request):
     """Homepage."""
-    post_list = Post.objects.filter(
-        pub_date__date__lte=timezone.now(),
-        is_published=True,
-        category__is_published=True
-    ).annotate(comment_count=Count('comments')
-               ).order_by('-pub_date')
-    paginator = Paginator(post_list, POSTS_IN_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-
+    page_obj = feed_page(request, FeedEntry.objects.all())
     return render(request, 'blog/index.html', {'page_obj': page_obj})
 
 
+@method_decorator(replica_reads, name='dispatch')
 class PostDetailView(LoginRequiredMixin, DetailView):
     """Post view."""
     model = Post
     form_class = PostForm
     template_name = 'blog/detail.html'
+    context_object_name = 'post'
+
+    def get_queryset(self):
+        return Post.objects.with_related()
+
+    def get_object(self, queryset=None):
+        try:
+            return super().get_object(queryset)
+        except Http404:
+            return super().get_object(archived_posts())
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['post'] = get_object_or_404(Post, id=self.kwargs['pk'])
         context['comments'] = (
             self.object.comments.select_related('author')
         )
-        context['form'] = CommentForm()
+        context['archived'] = isinstance(self.object, ArchivedPost)
+        if not context['archived']:
+            context['form'] = CommentForm()
         return context
 
 
+@replica_reads
 def category_posts(request, category_slug):
     """Category view."""
-    post_list = Post.objects.select_related(
-        'category', 'location', 'author').filter(
-        category__slug=category_slug,
-        is_published=True,
-        pub_date__date__lte=timezone.now()
-    ).annotate(comment_count=Count('comments')
-               ).order_by('-pub_date')
     category = get_object_or_404(
         Category.objects.filter(
             is_published=True
         ),
         slug=category_slug
     )
-    paginator = Paginator(post_list, POSTS_IN_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = feed_page(
+        request, FeedEntry.objects.filter(category_slug=category_slug)
+    )
     context = {'page_obj': page_obj,
                'category': category}
     return render(request, 'blog/category.html', context)
 
 
+def profile_posts(author, own):
+    """Hot then archived posts of `author`, scheduled ones only if `own`."""
+    post_list = Post.objects.with_related().filter(
+        author=author
+    ).with_comment_count()
+    archived = ArchivedPost.objects.select_related(
+        'author', 'category', 'location'
+    ).filter(author=author).annotate(
+        comment_count=Count('comments')
+    ).order_by('-pub_date')
+    if not own:
+        post_list = post_list.filter(pub_date__lte=timezone.now())
+        archived = archived.filter(pub_date__lte=timezone.now())
+    return ChainedPosts(post_list, archived)
+
+
+@method_decorator(replica_reads, name='dispatch')
 class ProfileListView(ListView):
     """User page."""
     model = Post
@@ -75,20 +121,12 @@ class ProfileListView(ListView):
     paginate_by = POSTS_IN_PAGE
 
     def dispatch(self, request, *args, **kwargs):
-        self.user = get_object_or_404(User, username=self.kwargs['username'])
+        self.user = get_object_or_404(
+            User, username=self.kwargs['username'], is_active=True)
         return super().dispatch(request, *args, **kwargs)
 
     def get_queryset(self):
-        if self.request.user.username == self.kwargs['username']:
-            return Post.objects.select_related('author').filter(
-                author__username=self.kwargs['username']
-            ).annotate(comment_count=Count('comments')
-                       ).order_by('-pub_date')
-        return Post.objects.select_related('author').filter(
-            author__username=self.kwargs['username'],
-            pub_date__lte=timezone.now()
-        ).annotate(comment_count=Count('comments')
-                   ).order_by('-pub_date')
+        return profile_posts(self.user, self.request.user == self.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -103,11 +141,11 @@ class ProfileListView(ListView):
         )
 
 
-class ProfileUpdateView(LoginRequiredMixin, UpdateView):
+class ProfileUpdateView(
+        LoginRequiredMixin, SerializedWriteMixin, UpdateView):
     """Profile change."""
     model = User
-    pk_url_kwarg = 'username'
-    fields = '__all__'
+    form_class = ProfileForm
     template_name = 'blog/user.html'
 
     def get_object(self, queryset=None):
@@ -121,7 +159,8 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(
+        LoginRequiredMixin, SerializedWriteMixin, CreateView):
     """Create post."""
     model = Post
     form_class = PostForm
@@ -140,12 +179,16 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         )
 
 
-class PostUpdateView(LoginRequiredMixin, UpdateView):
+class PostUpdateView(
+        LoginRequiredMixin, SerializedWriteMixin, UpdateView):
     """Editing post."""
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
 
+    def get_queryset(self):
+        return Post.objects.with_related()
+
     def dispatch(self, request, *args, **kwargs):
         post_ = get_object_or_404(Post, pk=self.kwargs['pk'])
         if self.request.user != post_.author:
@@ -173,10 +216,17 @@ class PostDeleteView(LoginRequiredMixin, DeleteView):
             return redirect('blog:post_detail', pk=kwargs['pk'])
         return super().dispatch(request, *args, **kwargs)
 
+    def get_queryset(self):
+        return Post.objects.with_related()
+
+    def delete(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        serialized_write(self.object.soft_delete)()
+        return redirect(self.get_success_url())
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        instance = get_object_or_404(Post, pk=self.kwargs['pk'])
-        context['form'] = {'instance': instance}
+        context['form'] = {'instance': self.object}
         return context
 
     def get_success_url(self):
@@ -187,7 +237,8 @@ class PostDeleteView(LoginRequiredMixin, DeleteView):
         )
 
 
-class CommentCreateView(LoginRequiredMixin, CreateView):
+class CommentCreateView(
+        LoginRequiredMixin, SerializedWriteMixin, CreateView):
     """Create comment."""
     post_ = None
     model = Comment
@@ -208,7 +259,8 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
             'blog:post_detail', kwargs={'pk': self.object.post.id})
 
 
-class CommentUpdateView(LoginRequiredMixin, UpdateView):
+class CommentUpdateView(
+        LoginRequiredMixin, SerializedWriteMixin, UpdateView):
     """Editing comment."""
     model = Comment
     form_class = CommentForm
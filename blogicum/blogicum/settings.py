@@ -1,4 +1,6 @@
+import os
 from pathlib import Path
+from tempfile import gettempdir
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -14,6 +16,7 @@ ALLOWED_HOSTS = [
 INSTALLED_APPS = [
     'pages.apps.PagesConfig',
     'blog.apps.BlogConfig',
+    'core.apps.CoreConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -24,20 +27,27 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.replicas.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ProfileMiddleware',
+    'core.middleware.SamplingMiddleware',
+    'core.middleware.NPlusOneMiddleware',
+    'core.middleware.TemplateProfileMiddleware',
+    'core.middleware.ServerTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.backends.django.DjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -55,8 +65,27 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    }
+}
+
+# Aliases of read replicas in DATABASES, kept in sync by
+# `python manage.py replicate` locally, for example
+# 'replica1': {**DATABASES['default'], 'NAME': BASE_DIR / 'replica1.sqlite3',
+#              'TEST': {'MIRROR': 'default'}}.
+DATABASE_REPLICAS = []
+
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+
+REPLICA_STICKY_SECONDS = 10
+
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.LocMemCache',
     }
 }
 
@@ -109,9 +138,80 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 POSTS_IN_PAGE = 10
 
+FEED_ITEMS = 20
+
+FEED_CACHE_TIMEOUT = 60 * 5
+
+# Its mtime is the feed version shared by all processes on the host.
+FEED_VERSION_FILE = Path(gettempdir()) / 'blogicum-feed-version'
+
+SITEMAP_CHUNK_SIZE = 10000
+
+API_MAX_LIMIT = 100
+
+NPLUSONE_ENABLED = DEBUG
+
+NPLUSONE_RAISE = False
+
+NPLUSONE_THRESHOLD = 3
+
+NPLUSONE_ALLOWLIST = []
+
+METRICS_ENABLED = True
+
+METRICS_DIR = Path(gettempdir()) / 'blogicum-metrics'
+
+METRICS_TOKEN = None
+
+SLOW_QUERY_LOG_ENABLED = True
+
+SLOW_QUERY_THRESHOLD_MS = 100
+
+# Share of slow SELECTs logged with EXPLAIN, run after the query on
+# the request's connection; never inside a transaction.
+SLOW_QUERY_EXPLAIN_RATE = 0.01
+
+SLOW_QUERY_LOG_FILE = BASE_DIR / 'logs' / 'slow_queries.log'
+
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+
+SLOW_QUERY_LOG_BACKUPS = 5
+
+TEMPLATE_PROFILING = False
+
+TEMPLATE_PROFILE_DIR = BASE_DIR / 'logs' / 'templates'
+
+TEMPLATE_PROFILE_TOP = 10
+
+SERVER_TIMING_ENABLED = True
+
+PROFILING_ENABLED = True
+
+PROFILE_DIR = BASE_DIR / 'logs' / 'profiles'
+
+# Seconds of CPU time between samples, e.g. 0.01; None turns it off.
+SAMPLING_INTERVAL = None
+
+SAMPLING_DIR = BASE_DIR / 'logs' / 'samples'
+
+SAMPLING_FLUSH_INTERVAL = 60
+
+WRITE_LOCK_DIR = Path(gettempdir()) / 'blogicum-locks'
+
+WRITE_LOCK_TIMEOUT = 10
+
+WRITE_RETRIES = 3
+
+# Serve the feeds and post pages with `blog.async_views`; asgi.py turns
+# it on, the sync views stay for WSGI.
+ASYNC_VIEWS = os.environ.get('BLOGICUM_ASYNC_VIEWS') == '1'
+
+# Threads, and so at most connections, the async views query through.
+ASYNC_DB_WORKERS = 16
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
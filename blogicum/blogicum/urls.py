@@ -10,6 +10,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('blog.urls', namespace='blog')),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('', include('core.urls', namespace='core')),
     path('auth/', include('django.contrib.auth.urls')),
     path(
         'auth/registration/',
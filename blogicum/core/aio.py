@@ -0,0 +1,80 @@
+"""Async request handling on top of the synchronous ORM.
+
+`run_sync` runs blocking code, the ORM, cache calls and template rendering,
+in a dedicated pool of `ASYNC_DB_WORKERS` threads instead of the single
+thread Django uses for sync code under ASGI. Concurrent requests can query
+in parallel, but never hold more connections than there are workers.
+
+`HybridMiddleware` serves both sync and async handlers, so the project
+middleware doesn't switch the ASGI chain to sync mode. The diagnostic
+middleware (N+1 detection, template profiling and sampling) is sync-only
+and turns the chain synchronous while it is enabled.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from . import stats
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            settings.ASYNC_DB_WORKERS, thread_name_prefix='async-db'
+        )
+    return _executor
+
+
+def _call(func, args, kwargs):
+    # Executor threads keep their connections between calls, as request
+    # threads do between requests.
+    close_old_connections()
+    with stats.track_queries():
+        return func(*args, **kwargs)
+
+
+async def run_sync(func, *args, **kwargs):
+    """Await the blocking `func` run in the bounded executor."""
+    return await sync_to_async(
+        _call, thread_sensitive=False, executor=get_executor()
+    )(func, args, kwargs)
+
+
+class HybridMiddleware:
+    """Middleware for both sync and async handlers: subclasses put their
+    work into the `around()` context manager and `process()`."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Makes Django's handler await this middleware.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with self.around(request) as state:
+            response = self.get_response(request)
+        return self.process(request, response, state)
+
+    async def __acall__(self, request):
+        with self.around(request) as state:
+            response = await self.get_response(request)
+        return self.process(request, response, state)
+
+    @contextmanager
+    def around(self, request):
+        yield None
+
+    def process(self, request, response, state):
+        return response
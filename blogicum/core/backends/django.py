@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.template.backends import django
+
+from .. import stats
+from ..templates import instrument
+
+
+class Template(django.Template):
+    """Adds the time of the outermost render to the request stats."""
+
+    def render(self, context=None, request=None):
+        request_stats = stats.get_current()
+        if request_stats is None or request_stats.rendering:
+            return super().render(context, request)
+        request_stats.rendering = True
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            request_stats.rendering = False
+            request_stats.template_time += time.perf_counter() - started
+
+
+class DjangoTemplates(django.DjangoTemplates):
+    """The standard backend with render timing, instrumented in detail
+    when `TEMPLATE_PROFILING` is on."""
+
+    def __init__(self, params):
+        super().__init__(params)
+        if settings.TEMPLATE_PROFILING:
+            instrument()
+
+    def from_string(self, template_code):
+        return Template(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return Template(super().get_template(template_name).template, self)
@@ -0,0 +1,62 @@
+"""SQLite backend tuned for a web server.
+
+Every new connection gets `PRAGMAS` merged with `OPTIONS['pragmas']`:
+WAL lets readers work while one writer commits, the rest trades
+durability of the last transactions on power loss and memory for speed.
+`OPTIONS['transaction_mode']` backports the option of Django 5.1, with
+IMMEDIATE a transaction waits for the write lock up front instead of
+failing when it turns into a write.
+"""
+from django.db.backends.sqlite3 import base
+
+PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'memory',
+    'busy_timeout': 5000,
+}
+
+
+def apply_pragmas(connection, pragmas):
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}').fetchall()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        params.pop('transaction_mode', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        apply_pragmas(connection, {
+            **PRAGMAS, **self.settings_dict['OPTIONS'].get('pragmas', {})
+        })
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
+
+    def is_usable(self):
+        try:
+            self.connection.execute('SELECT 1')
+        except base.Database.Error:
+            return False
+        return True
+
+    def close_if_unusable_or_obsolete(self):
+        # Django 3.2 only checks persistent connections after an error,
+        # CONN_HEALTH_CHECKS checks them on every request.
+        if (self.connection is not None
+                and self.settings_dict.get('CONN_HEALTH_CHECKS')
+                and not self.in_atomic_block
+                and not self.is_usable()):
+            self.close()
+            return
+        super().close_if_unusable_or_obsolete()
@@ -0,0 +1,38 @@
+import time
+
+from django.core.cache.backends import locmem
+
+from .stats import get_current
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    """Count hits, misses and time of cache calls in the request stats."""
+
+    def get(self, key, default=None, version=None):
+        stats = get_current()
+        if stats is None:
+            return super().get(key, default, version)
+        started = time.perf_counter()
+        value = super().get(key, _MISSING, version)
+        stats.cache_time += time.perf_counter() - started
+        if value is _MISSING:
+            stats.cache_misses += 1
+            return default
+        stats.cache_hits += 1
+        return value
+
+    def set(self, *args, **kwargs):
+        stats = get_current()
+        if stats is None:
+            return super().set(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return super().set(*args, **kwargs)
+        finally:
+            stats.cache_time += time.perf_counter() - started
+
+
+class LocMemCache(InstrumentedCacheMixin, locmem.LocMemCache):
+    pass
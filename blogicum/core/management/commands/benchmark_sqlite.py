@@ -0,0 +1,121 @@
+import multiprocessing
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from core.backends.sqlite3.base import PRAGMAS, apply_pragmas
+
+READS_PER_REQUEST = 5
+MODES = {
+    # What `django.db.backends.sqlite3` did: rollback journal and a new
+    # connection for every request.
+    'default': {'pragmas': {}, 'persistent': False},
+    'tuned': {'pragmas': PRAGMAS, 'persistent': True},
+}
+
+
+def _connect(path, pragmas):
+    connection = sqlite3.connect(path, timeout=5, isolation_level=None)
+    apply_pragmas(connection, pragmas)
+    return connection
+
+
+def _request(connection, rows, write):
+    for _ in range(READS_PER_REQUEST):
+        connection.execute(
+            'SELECT value FROM item WHERE id = ?',
+            (random.randint(1, rows),)
+        ).fetchall()
+    if write:
+        connection.execute('BEGIN')
+        connection.execute(
+            'UPDATE item SET value = ? WHERE id = ?',
+            (str(random.random()), random.randint(1, rows))
+        )
+        connection.execute('COMMIT')
+
+
+def _worker(path, mode, rows, write, deadline, results):
+    settings = MODES[mode]
+    connection = None
+    done = errors = 0
+    while time.monotonic() < deadline:
+        if connection is None:
+            connection = _connect(path, settings['pragmas'])
+        try:
+            _request(connection, rows, write)
+            done += 1
+        except sqlite3.OperationalError:
+            errors += 1
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+        if not settings['persistent']:
+            connection.close()
+            connection = None
+    results.put((write, done, errors))
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность SQLite с настройками Django '
+            'по умолчанию и с настройками core.backends.sqlite3 при '
+            'конкурентных читателях и писателях.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--duration', type=float, default=5)
+        parser.add_argument('--rows', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{"режим":<10}{"чтений/с":>12}{"записей/с":>12}{"ошибок":>10}'
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for mode in MODES:
+                path = str(Path(directory) / f'{mode}.sqlite3')
+                self.prepare(path, mode, options['rows'])
+                reads, writes, errors = self.run(path, mode, options)
+                self.stdout.write(
+                    f'{mode:<10}{reads:>12.0f}{writes:>12.0f}{errors:>10}'
+                )
+
+    def prepare(self, path, mode, rows):
+        connection = _connect(path, MODES[mode]['pragmas'])
+        connection.execute(
+            'CREATE TABLE item (id INTEGER PRIMARY KEY, value TEXT)')
+        connection.execute('BEGIN')
+        connection.executemany(
+            'INSERT INTO item (value) VALUES (?)',
+            ((str(number),) for number in range(rows))
+        )
+        connection.execute('COMMIT')
+        connection.close()
+
+    def run(self, path, mode, options):
+        results = multiprocessing.Queue()
+        deadline = time.monotonic() + options['duration']
+        workers = [
+            multiprocessing.Process(target=_worker, args=(
+                path, mode, options['rows'], write, deadline, results))
+            for write in
+            [False] * options['readers'] + [True] * options['writers']
+        ]
+        for worker in workers:
+            worker.start()
+        totals = {False: 0, True: 0}
+        errors = 0
+        for _ in workers:
+            write, done, failed = results.get()
+            totals[write] += done
+            errors += failed
+        for worker in workers:
+            worker.join()
+        return (
+            totals[False] * READS_PER_REQUEST / options['duration'],
+            totals[True] / options['duration'],
+            errors,
+        )
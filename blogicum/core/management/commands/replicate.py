@@ -0,0 +1,41 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def copy_database(source, target, pages=1024):
+    """Copy the SQLite file `source` to `target` with the online backup
+    API, `pages` pages per step so the primary isn't locked for long."""
+    with sqlite3.connect(source) as source_connection, \
+            sqlite3.connect(target) as target_connection:
+        source_connection.backup(target_connection, pages=pages)
+    source_connection.close()
+    target_connection.close()
+
+
+class Command(BaseCommand):
+    help = ('Копирует основную базу SQLite во все DATABASE_REPLICAS: '
+            'замена репликации для локальной проверки реплик.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float,
+            help='Повторять каждые N секунд, пока не прервут.')
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('DATABASE_REPLICAS не заданы.')
+        source = str(connections[DEFAULT_DB_ALIAS].settings_dict['NAME'])
+        while True:
+            for alias in settings.DATABASE_REPLICAS:
+                target = str(connections[alias].settings_dict['NAME'])
+                copy_database(source, target)
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'{alias}: {target}')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS('Реплики обновлены.'))
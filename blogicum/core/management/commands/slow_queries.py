@@ -0,0 +1,72 @@
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+def log_files(path):
+    """The log and its rotated copies, oldest first."""
+    path = Path(path)
+    rotated = sorted(
+        path.parent.glob(f'{path.name}.*'),
+        key=lambda item: int(item.suffix[1:]) if item.suffix[1:].isdigit()
+        else 0,
+        reverse=True
+    )
+    return [*rotated, path] if path.exists() else rotated
+
+
+def read_groups(paths):
+    """Log entries aggregated by normalized SQL."""
+    groups = defaultdict(lambda: {
+        'count': 0, 'total': 0.0, 'max': 0.0, 'views': set(), 'plan': None,
+    })
+    for path in paths:
+        with open(path, encoding='utf-8') as stream:
+            for line in stream:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                group = groups[entry['sql']]
+                group['count'] += 1
+                group['total'] += entry['duration_ms']
+                if entry['duration_ms'] >= group['max']:
+                    group['max'] = entry['duration_ms']
+                    group['plan'] = entry.get('plan')
+                if entry.get('view'):
+                    group['views'].add(entry['view'])
+    return groups
+
+
+class Command(BaseCommand):
+    help = 'Показывает самые затратные медленные запросы из журнала.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10)
+        parser.add_argument(
+            '--path', default=str(settings.SLOW_QUERY_LOG_FILE))
+
+    def handle(self, *args, **options):
+        groups = read_groups(log_files(options['path']))
+        if not groups:
+            self.stdout.write('Медленных запросов не найдено.')
+            return
+        top = sorted(
+            groups.items(), key=lambda item: item[1]['total'], reverse=True
+        )[:options['top']]
+        for number, (sql, group) in enumerate(top, start=1):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{number}. всего {group["total"]:.0f} мс, '
+                f'{group["count"]} раз, среднее '
+                f'{group["total"] / group["count"]:.1f} мс, '
+                f'максимум {group["max"]:.1f} мс'
+            ))
+            if group['views']:
+                self.stdout.write(
+                    '   представления: ' + ', '.join(sorted(group['views'])))
+            self.stdout.write(f'   {sql}')
+            for row in group['plan'] or ():
+                self.stdout.write(f'     {row}')
@@ -0,0 +1,96 @@
+import multiprocessing
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, transaction
+
+from blog.models import Category, Comment, Post, User
+from core.writes import serialized_write
+
+
+def _write(post_id, user_id, number):
+    # Read first, then write: a deferred transaction fails here at once
+    # when another process committed in between.
+    post = Post.objects.get(pk=post_id)
+    Comment.objects.create(
+        post=post, author_id=user_id, text=f'Комментарий {number}')
+
+
+def _worker(name, writes, serialized, post_id, user_id, results):
+    connection.close()
+    connection.settings_dict['NAME'] = name
+    if not serialized:
+        connection.settings_dict['OPTIONS'].pop('transaction_mode', None)
+    write = serialized_write(_write) if serialized else _write
+    errors = 0
+    for number in range(writes):
+        try:
+            if serialized:
+                write(post_id, user_id, number)
+            else:
+                with transaction.atomic():
+                    write(post_id, user_id, number)
+        except OperationalError:
+            errors += 1
+    connection.close()
+    results.put(errors)
+
+
+class Command(BaseCommand):
+    help = ('Нагружает SQLite записями комментариев из нескольких '
+            'процессов и считает ошибки "database is locked".')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8)
+        parser.add_argument('--writes', type=int, default=200)
+        parser.add_argument(
+            '--unserialized', action='store_true',
+            help='Писать без очереди и BEGIN IMMEDIATE, для сравнения.')
+
+    def handle(self, *args, **options):
+        original = dict(connection.settings_dict)
+        with tempfile.TemporaryDirectory() as directory:
+            name = str(Path(directory) / 'stress.sqlite3')
+            try:
+                errors, elapsed = self.stress(name, options)
+            finally:
+                connection.close()
+                connection.settings_dict.update(original)
+        total = options['writers'] * options['writes']
+        self.stdout.write(
+            f'{total - errors} записей из {total} за {elapsed:.1f} с, '
+            f'ошибок блокировки: {errors}.'
+        )
+        if errors and not options['unserialized']:
+            raise CommandError('Записи завершились ошибками блокировки.')
+
+    def stress(self, name, options):
+        connection.close()
+        connection.settings_dict['NAME'] = name
+        call_command('migrate', verbosity=0)
+        user = User.objects.create(username='stress')
+        post = Post.objects.create(
+            title='Нагрузка', text='Текст', author=user,
+            pub_date=datetime(2000, 1, 1, tzinfo=timezone.utc),
+            category=Category.objects.create(
+                title='Категория', description='Описание', slug='stress'),
+        )
+        connection.close()
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_worker, args=(
+                name, options['writes'], not options['unserialized'],
+                post.pk, user.pk, results))
+            for _ in range(options['writers'])
+        ]
+        started = time.monotonic()
+        for worker in workers:
+            worker.start()
+        errors = sum(results.get() for _ in workers)
+        for worker in workers:
+            worker.join()
+        return errors, time.monotonic() - started
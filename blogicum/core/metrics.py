@@ -0,0 +1,287 @@
+"""Prometheus metrics shared by all worker processes.
+
+Every process appends to its own memory-mapped file under a process-wide
+lock, so updates need no IPC; the exporter sums all the files. Files of
+processes that have exited are folded into one `merged.db`, as in the
+multiprocess mode of prometheus_client, so the directory doesn't grow
+with worker restarts.
+"""
+import fcntl
+import mmap
+import os
+import re
+import struct
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+INITIAL_SIZE = 1 << 16
+HEADER = struct.Struct('<Q')
+KEY_LENGTH = struct.Struct('<I')
+VALUE = struct.Struct('<d')
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+SIZE_BUCKETS = (1 << 10, 1 << 13, 1 << 16, 1 << 19, 1 << 22, 1 << 25)
+LE_LABEL = re.compile(r',?le="([^"]+)"')
+MERGED_FILE = 'merged.db'
+LOCK_FILE = 'merge.lock'
+
+
+def _value_offset(key_length):
+    return (KEY_LENGTH.size + key_length + 7) // 8 * 8
+
+
+def read_entries(buffer, used):
+    """Yield (key, value position, value) of a metrics file."""
+    position = HEADER.size
+    while position < used:
+        key_length = KEY_LENGTH.unpack_from(buffer, position)[0]
+        start = position + KEY_LENGTH.size
+        key = bytes(buffer[start:start + key_length]).decode()
+        value_position = position + _value_offset(key_length)
+        yield key, value_position, VALUE.unpack_from(
+            buffer, value_position)[0]
+        position = value_position + VALUE.size
+
+
+class MmapValues:
+    """Append-only `key -> float` file with a single writer.
+
+    The header holds the used size, each entry is the key length, the key
+    padded to 8 bytes and the value, which is updated in place.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'a+b')
+        if os.fstat(self.file.fileno()).st_size < INITIAL_SIZE:
+            self.file.truncate(INITIAL_SIZE)
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        self.used = HEADER.unpack_from(self.map, 0)[0] or HEADER.size
+        self.positions = {
+            key: position
+            for key, position, _ in read_entries(self.map, self.used)
+        }
+
+    def add(self, key, amount):
+        position = self.positions.get(key)
+        if position is None:
+            position = self._append(key)
+        value = VALUE.unpack_from(self.map, position)[0]
+        VALUE.pack_into(self.map, position, value + amount)
+
+    def _append(self, key):
+        encoded = key.encode()
+        value_position = self.used + _value_offset(len(encoded))
+        end = value_position + VALUE.size
+        if end > len(self.map):
+            size = len(self.map)
+            while end > size:
+                size *= 2
+            self.map.close()
+            self.file.truncate(size)
+            self.map = mmap.mmap(self.file.fileno(), 0)
+        KEY_LENGTH.pack_into(self.map, self.used, len(encoded))
+        key_start = self.used + KEY_LENGTH.size
+        self.map[key_start:key_start + len(encoded)] = encoded
+        VALUE.pack_into(self.map, value_position, 0.0)
+        self.used = end
+        HEADER.pack_into(self.map, 0, self.used)
+        self.positions[key] = value_position
+        return value_position
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _file_pid(path):
+    # `<pid>.db`, or `<pid>_<thread>.db` of the per-thread layout.
+    try:
+        return int(path.stem.split('_')[0])
+    except ValueError:
+        return None
+
+
+@contextmanager
+def _directory_lock(directory):
+    with open(directory / LOCK_FILE, 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def merge_dead(directory):
+    """Add the files of exited processes to `merged.db` and remove them;
+    the caller holds the directory lock."""
+    dead = [
+        path for path in directory.glob('*.db')
+        if _file_pid(path) is not None and not _is_alive(_file_pid(path))
+    ]
+    if not dead:
+        return
+    merged = MmapValues(directory / MERGED_FILE)
+    try:
+        for path in dead:
+            for key, value in _read_file(path):
+                merged.add(key, value)
+            merged.map.flush()
+            path.unlink()
+    finally:
+        merged.close()
+
+
+_lock = threading.Lock()
+_state = {}
+
+
+@contextmanager
+def _values():
+    """The file of the current process, locked for updates."""
+    directory = Path(settings.METRICS_DIR)
+    with _lock:
+        if _state.get('key') != (os.getpid(), directory):
+            directory.mkdir(parents=True, exist_ok=True)
+            with _directory_lock(directory):
+                merge_dead(directory)
+            _state['values'] = MmapValues(directory / f'{os.getpid()}.db')
+            _state['key'] = (os.getpid(), directory)
+        yield _state['values']
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _labels(names, values):
+    pairs = ','.join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+    return f'{{{pairs}}}' if pairs else ''
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        REGISTRY.append(self)
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with _values() as values:
+            values.add(f'{self.name}{_labels(self.labels, labels)}', amount)
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, description, labels=(), buckets=()):
+        super().__init__(name, description, labels)
+        self.buckets = buckets
+
+    def observe(self, value, *labels):
+        label_text = _labels(self.labels, labels)
+        with _values() as values:
+            for bound in (*self.buckets, '+Inf'):
+                if bound == '+Inf' or value <= bound:
+                    values.add(self.name + '_bucket' + _labels(
+                        (*self.labels, 'le'), (*labels, bound)), 1)
+            values.add(f'{self.name}_sum{label_text}', value)
+            values.add(f'{self.name}_count{label_text}', 1)
+
+
+REGISTRY = []
+
+REQUEST_DURATION = Histogram(
+    'blogicum_request_duration_seconds', 'Время обработки запроса.',
+    ('view',), DURATION_BUCKETS)
+REQUESTS = Counter(
+    'blogicum_requests_total', 'Число запросов.', ('view', 'status'))
+RESPONSE_SIZE = Histogram(
+    'blogicum_response_size_bytes', 'Размер ответа.',
+    ('view',), SIZE_BUCKETS)
+DB_QUERIES = Counter(
+    'blogicum_db_queries_total', 'Число запросов к БД.', ('view',))
+DB_TIME = Counter(
+    'blogicum_db_query_seconds_total', 'Время запросов к БД.', ('view',))
+CACHE_REQUESTS = Counter(
+    'blogicum_cache_requests_total', 'Обращения к кэшу.',
+    ('view', 'result'))
+WRITE_LOCK_WAIT = Histogram(
+    'blogicum_write_lock_wait_seconds', 'Ожидание блокировки записи.',
+    ('database',), DURATION_BUCKETS)
+WRITE_LOCK_TIMEOUTS = Counter(
+    'blogicum_write_lock_timeouts_total',
+    'Записи, не дождавшиеся блокировки.', ('database',))
+WRITE_RETRIES = Counter(
+    'blogicum_write_retries_total',
+    'Повторы записи после ошибки блокировки.', ('database',))
+
+
+def _read_file(path):
+    """(key, value) pairs of a metrics file."""
+    with open(path, 'rb') as stream:
+        data = stream.read()
+    if len(data) < HEADER.size:
+        return []
+    used = min(HEADER.unpack_from(data, 0)[0], len(data))
+    return [(key, value) for key, _, value in read_entries(data, used)]
+
+
+def read_totals():
+    """Sum the values of all metrics files."""
+    totals = defaultdict(float)
+    directory = Path(settings.METRICS_DIR)
+    if not directory.exists():
+        return totals
+    with _directory_lock(directory):
+        merge_dead(directory)
+        for path in directory.glob('*.db'):
+            for key, value in _read_file(path):
+                totals[key] += value
+    return totals
+
+
+def _sort_key(key):
+    match = LE_LABEL.search(key)
+    if match is None:
+        return key, 0.0
+    return LE_LABEL.sub('', key), float(match.group(1))
+
+
+def export():
+    """All metrics in the Prometheus text exposition format."""
+    totals = read_totals()
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.description}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        samples = sorted(
+            (key for key in totals if key.split('{')[0] in (
+                metric.name, f'{metric.name}_bucket',
+                f'{metric.name}_sum', f'{metric.name}_count')),
+            key=_sort_key
+        )
+        lines.extend(f'{key} {totals[key]:.17g}' for key in samples)
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,212 @@
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from copy import copy
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import metrics, profiling, stats, templates
+from .aio import HybridMiddleware, run_sync
+from .nplusone import QueryGroups, report
+from .timing import add_server_timing
+
+logger = logging.getLogger(__name__)
+
+
+class NPlusOneMiddleware:
+    """Warn about (or fail on) repeated single-row queries of a request.
+    Meant for development and staging, see `NPLUSONE_*` settings."""
+
+    def __init__(self, get_response):
+        if not settings.NPLUSONE_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        groups = QueryGroups(settings.NPLUSONE_THRESHOLD)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(groups))
+            response = self.get_response(request)
+        match = request.resolver_match
+        view_name = match.view_name if match else request.path
+        problems = groups.problems()
+        if problems and view_name not in settings.NPLUSONE_ALLOWLIST:
+            report(view_name, problems)
+        return response
+
+
+class MetricsMiddleware(HybridMiddleware):
+    """Record latency, size, DB and cache usage of every request
+    labeled by the view name."""
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    @contextmanager
+    def around(self, request):
+        started = time.perf_counter()
+        with stats.collect() as request_stats:
+            yield started, request_stats
+
+    def process(self, request, response, state):
+        started, request_stats = state
+        elapsed = time.perf_counter() - started
+        view = request_stats.view_name or 'unresolved'
+        metrics.REQUEST_DURATION.observe(elapsed, view)
+        metrics.REQUESTS.inc(view, response.status_code)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe(len(response.content), view)
+        metrics.DB_QUERIES.inc(view, amount=request_stats.db_queries)
+        metrics.DB_TIME.inc(view, amount=request_stats.db_time)
+        if request_stats.cache_hits:
+            metrics.CACHE_REQUESTS.inc(
+                view, 'hit', amount=request_stats.cache_hits)
+        if request_stats.cache_misses:
+            metrics.CACHE_REQUESTS.inc(
+                view, 'miss', amount=request_stats.cache_misses)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request_stats = stats.get_current()
+        if request_stats is not None:
+            request_stats.view_name = request.resolver_match.view_name
+
+
+class TemplateProfileMiddleware:
+    """Time the templates, tags and filters rendered by each request,
+    report the slowest in `Server-Timing` and append the stacks to
+    `TEMPLATE_PROFILE_DIR/<view>.folded`."""
+
+    def __init__(self, get_response):
+        if not settings.TEMPLATE_PROFILING:
+            raise MiddlewareNotUsed
+        templates.instrument()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with templates.profile() as profile:
+            response = self.get_response(request)
+        if not profile.total:
+            return response
+        add_server_timing(response, 'tpl', profile.total * 1000, 'templates')
+        for name, cumulative, own in profile.top(
+                settings.TEMPLATE_PROFILE_TOP):
+            add_server_timing(
+                response, 'tpl', cumulative * 1000,
+                f'{name} (self {own * 1000:.2f} ms)'
+            )
+        match = request.resolver_match
+        view_name = match.view_name if match else 'unresolved'
+        profile.write(
+            Path(settings.TEMPLATE_PROFILE_DIR) / f'{view_name}.folded'
+        )
+        return response
+
+
+class ServerTimingMiddleware(HybridMiddleware):
+    """Report URL resolution, view, template, DB and cache time of the
+    request in `Server-Timing`. DB and cache time overlap the view and
+    template time they were spent in."""
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING_ENABLED:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    @contextmanager
+    def around(self, request):
+        started = time.perf_counter()
+        with stats.collect() as request_stats:
+            yield started, request_stats, copy(request_stats)
+
+    def process(self, request, response, state):
+        started, request_stats, before = state
+        finished = time.perf_counter()
+        view_started = getattr(request, '_view_started', finished)
+        template_time = request_stats.template_time - before.template_time
+        cache_calls = (
+            request_stats.cache_hits + request_stats.cache_misses
+            - before.cache_hits - before.cache_misses
+        )
+        timings = (
+            ('url', view_started - started, None),
+            ('view', finished - view_started - template_time, None),
+            ('template', template_time, None),
+            ('db', request_stats.db_time - before.db_time,
+             f'{request_stats.db_queries - before.db_queries} queries'),
+            ('cache', request_stats.cache_time - before.cache_time,
+             f'{cache_calls} calls'),
+            ('total', finished - started, None),
+        )
+        for name, seconds, description in timings:
+            add_server_timing(
+                response, name, max(seconds, 0) * 1000, description)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._view_started = time.perf_counter()
+
+
+class ProfileMiddleware(HybridMiddleware):
+    """Run a request of a staff user under cProfile when asked with
+    `?profile=1` or the `X-Profile: 1` header."""
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.wanted(request):
+            return self.get_response(request)
+        return self.profile(self.get_response, request)
+
+    async def __acall__(self, request):
+        if not await run_sync(self.wanted, request):
+            return await self.get_response(request)
+        # cProfile sees one thread, so the profiled request runs in it.
+        return await run_sync(
+            self.profile, async_to_sync(self.get_response), request)
+
+    def wanted(self, request):
+        return ((request.GET.get('profile') == '1'
+                 or request.headers.get('X-Profile') == '1')
+                and request.user.is_staff)
+
+    def profile(self, get_response, request):
+        response, path = profiling.profile_request(get_response, request)
+        response['X-Profile-File'] = path.name
+        return response
+
+
+class SamplingMiddleware:
+    """Tag the samples of `SAMPLING_INTERVAL` seconds by the view the
+    thread is serving."""
+
+    def __init__(self, get_response):
+        if not settings.SAMPLING_INTERVAL:
+            raise MiddlewareNotUsed
+        if threading.current_thread() is not threading.main_thread():
+            logger.warning('Сэмплер запускается только в главном потоке.')
+            raise MiddlewareNotUsed
+        self.sampler = profiling.get_sampler()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            self.sampler.exit()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self.sampler.enter(request.resolver_match.view_name)
@@ -0,0 +1,67 @@
+import logging
+import sys
+from collections import Counter
+
+from django.conf import settings
+
+from .sql import is_single_key_lookup, normalize_sql
+
+logger = logging.getLogger('core.nplusone')
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+def find_origin():
+    """Innermost template tag and project code line of the current stack."""
+    template = code = None
+    frame = sys._getframe(1)
+    base_dir = str(settings.BASE_DIR)
+    while frame is not None and (template is None or code is None):
+        node = frame.f_locals.get('self')
+        if (template is None and frame.f_code.co_name == 'render_annotated'
+                and getattr(node, 'origin', None) is not None):
+            template = f'{node.origin.template_name}:{node.token.lineno}'
+        filename = frame.f_code.co_filename
+        if (code is None and filename.startswith(base_dir)
+                and 'site-packages' not in filename
+                and f'{base_dir}/core/' not in filename):
+            code = f'{filename}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return template, code
+
+
+class QueryGroups:
+    """Execute wrapper counting statements of a request by normalized SQL
+    and remembering where repeated single-row loads came from."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.counts = Counter()
+        self.origins = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        normalized = normalize_sql(sql)
+        self.counts[normalized] += 1
+        if (self.counts[normalized] == self.threshold
+                and is_single_key_lookup(normalized)):
+            self.origins[normalized] = find_origin()
+        return execute(sql, params, many, context)
+
+    def problems(self):
+        return [
+            (sql, self.counts[sql], *origin)
+            for sql, origin in self.origins.items()
+        ]
+
+
+def report(view_name, problems):
+    message = '\n'.join(
+        f'N+1 в {view_name}: {count} одинаковых запросов\n'
+        f'  {sql}\n  шаблон: {template or "-"}\n  код: {code or "-"}'
+        for sql, count, template, code in problems
+    )
+    if settings.NPLUSONE_RAISE:
+        raise NPlusOneError(message)
+    logger.warning(message)
@@ -0,0 +1,121 @@
+"""Profilers for production: cProfile of a single request and a
+statistical sampler of every request.
+
+The sampler is driven by `SIGPROF`, so it costs nothing between samples
+and only sees CPU time. It has to be started from the main thread. The
+signal handler only counts stacks; request threads write them out when
+they leave a view.
+"""
+import atexit
+import cProfile
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+
+
+def profile_request(get_response, request):
+    """Run `get_response` under cProfile and store the stats in
+    `PROFILE_DIR`; return the response and the file path."""
+    profiler = cProfile.Profile()
+    response = profiler.runcall(get_response, request)
+    match = request.resolver_match
+    view_name = match.view_name if match else 'unresolved'
+    directory = Path(settings.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / '{}-{}.prof'.format(
+        view_name.replace(':', '-'), time.time_ns() // 1000
+    )
+    profiler.dump_stats(path)
+    return response, path
+
+
+class Sampler:
+    """Count the stacks of the threads serving views every `interval`
+    seconds of CPU time, tagged by the view name."""
+
+    def __init__(self, interval, directory, flush_interval):
+        self.interval = interval
+        self.path = Path(directory) / f'{os.getpid()}.folded'
+        self.flush_interval = flush_interval
+        self.views = {}
+        self.counts = Counter()
+        self.labels = {}
+        self.flushed = time.monotonic()
+        self.flush_lock = threading.Lock()
+
+    def start(self):
+        signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        atexit.register(self.stop)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+        self.flush()
+
+    def label(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            filename = os.path.basename(code.co_filename)
+            label = f'{code.co_name} ({filename}:{code.co_firstlineno})'
+            self.labels[code] = label
+        return label
+
+    def sample(self, signum, frame):
+        frames = sys._current_frames()
+        # The main thread is inside this handler, sample where it was.
+        frames[threading.main_thread().ident] = frame
+        for ident, view_name in list(self.views.items()):
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self.label(frame.f_code))
+                frame = frame.f_back
+            stack.append(view_name)
+            self.counts[';'.join(reversed(stack))] += 1
+
+    def flush(self):
+        # Never called from the signal handler: the swap is the only
+        # state it shares with `sample`, which takes no locks.
+        with self.flush_lock:
+            counts, self.counts = self.counts, Counter()
+            self.flushed = time.monotonic()
+            if not counts:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as stream:
+                stream.write(''.join(
+                    f'{stack} {count}\n' for stack, count in counts.items()
+                ))
+
+    def enter(self, view_name):
+        self.views[threading.get_ident()] = view_name
+
+    def exit(self):
+        self.views.pop(threading.get_ident(), None)
+        if time.monotonic() - self.flushed > self.flush_interval:
+            self.flush()
+
+
+_sampler = None
+
+
+def get_sampler():
+    """The sampler of this process, started on first use."""
+    global _sampler
+    if _sampler is None:
+        _sampler = Sampler(
+            settings.SAMPLING_INTERVAL,
+            settings.SAMPLING_DIR,
+            settings.SAMPLING_FLUSH_INTERVAL,
+        )
+        _sampler.start()
+    return _sampler
@@ -0,0 +1,121 @@
+"""Routing of feed and detail reads to read replicas.
+
+Only code wrapped in `replica_reads` reads from one of
+`DATABASE_REPLICAS`, everything else and all writes use `default`.
+After a request that wrote, `ReplicaMiddleware` pins the client to the
+primary for `REPLICA_STICKY_SECONDS` with a cookie, so users see their
+own changes while the replicas catch up.
+"""
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from .aio import HybridMiddleware
+
+STICKY_COOKIE = 'primary_until'
+REPLICA_APPS = {'blog'}
+
+_reads = ContextVar('replica_reads', default=False)
+_state = ContextVar('replica_state', default=None)
+
+
+class RequestState:
+
+    def __init__(self, pinned):
+        self.pinned = pinned
+        self.wrote = False
+
+
+@contextmanager
+def _replica_reads():
+    token = _reads.set(True)
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+def replica_reads(view):
+    """Let the reads of `view` go to a replica, including the lazy
+    querysets evaluated by its template."""
+    if asyncio.iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(*args, **kwargs):
+            # `run_sync` copies the context, so the executor threads
+            # read from replicas too.
+            with _replica_reads():
+                return await view(*args, **kwargs)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with _replica_reads():
+            response = view(*args, **kwargs)
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        return response
+    return wrapper
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (not replicas or not _reads.get()
+                or model._meta.app_label not in REPLICA_APPS):
+            return None
+        state = _state.get()
+        if state is not None and (state.pinned or state.wrote):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            # Replicas are copies of the primary made by `replicate`.
+            return False
+        return None
+
+
+class ReplicaMiddleware(HybridMiddleware):
+    """Pin clients that have just written to the primary."""
+
+    @contextmanager
+    def around(self, request):
+        try:
+            pinned = float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            pinned = False
+        state = RequestState(pinned)
+        token = _state.set(state)
+        try:
+            yield state
+        finally:
+            _state.reset(token)
+
+    def process(self, request, response, state):
+        if state.wrote:
+            response.set_cookie(
+                STICKY_COOKIE,
+                str(time.time() + settings.REPLICA_STICKY_SECONDS),
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,130 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from logging.handlers import (
+    QueueHandler, QueueListener, RotatingFileHandler
+)
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .sql import normalize_sql
+from .stats import get_current
+
+logger = logging.getLogger('core.slowlog')
+logger.propagate = False
+_state = threading.local()
+_listener = None
+_listener_lock = threading.Lock()
+MAX_PARAM_LENGTH = 200
+
+
+def _start_listener():
+    """Write records from a queue in a background thread, so the request
+    never waits for the disk."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        path = Path(settings.SLOW_QUERY_LOG_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            path, maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=settings.SLOW_QUERY_LOG_BACKUPS, encoding='utf-8'
+        )
+        records = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(records))
+        logger.setLevel(logging.INFO)
+        _listener = QueueListener(records, handler)
+        _listener.start()
+        atexit.register(stop)
+
+
+def stop():
+    """Flush queued records and close the log file."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers.clear()
+        _listener = None
+
+
+def _explain(connection, sql, params):
+    _state.explaining = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'{connection.ops.explain_query_prefix()} {sql}', params)
+            return [' '.join(map(str, row)) for row in cursor.fetchall()]
+    except Exception as error:
+        return [f'EXPLAIN не удался: {error}']
+    finally:
+        _state.explaining = False
+
+
+def _wants_plan(connection, sql, many):
+    # EXPLAIN is a second round trip on the request's own connection and
+    # inside an atomic block it would run in the user's transaction.
+    return (
+        not many
+        and not connection.in_atomic_block
+        and sql.lstrip().upper().startswith('SELECT')
+        and random.random() < settings.SLOW_QUERY_EXPLAIN_RATE
+    )
+
+
+def _params(params, many):
+    if params is None:
+        return None
+    if many:
+        return f'<{len(params)} наборов параметров>'
+    return [repr(value)[:MAX_PARAM_LENGTH] for value in params]
+
+
+def log_slow_queries(execute, sql, params, many, context):
+    """Execute wrapper logging statements slower than
+    `SLOW_QUERY_THRESHOLD_MS`, a `SLOW_QUERY_EXPLAIN_RATE` share of them
+    with their query plan."""
+    if getattr(_state, 'explaining', False):
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = (time.perf_counter() - started) * 1000
+        if duration >= settings.SLOW_QUERY_THRESHOLD_MS:
+            connection = context['connection']
+            plan = None
+            if _wants_plan(connection, sql, many):
+                plan = _explain(connection, sql, params)
+            stats = get_current()
+            _start_listener()
+            logger.info(json.dumps({
+                'time': timezone.now().isoformat(),
+                'database': connection.alias,
+                'duration_ms': round(duration, 3),
+                'view': getattr(stats, 'view_name', None),
+                'sql': normalize_sql(sql),
+                'params': _params(params, many),
+                'plan': plan,
+            }, ensure_ascii=False))
+
+
+def install(connection, **kwargs):
+    """`connection_created` receiver adding the wrapper once per
+    connection object.
+
+    A connection may open inside `execute_wrapper()` blocks of middleware,
+    which remove their wrapper with `pop()` from the end of the list.
+    """
+    if log_slow_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, log_slow_queries)
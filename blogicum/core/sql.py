@@ -0,0 +1,25 @@
+import re
+
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?\b')
+IN_LIST = re.compile(r'\bIN \((?:%s)(?:, %s)*\)')
+SPACES = re.compile(r'\s+')
+SINGLE_KEY_LOOKUP = re.compile(
+    r'WHERE "[^"]+"\."[^"]+" = %s(?: ORDER BY [^%]*)?(?: LIMIT %s)?$'
+)
+
+
+def normalize_sql(sql):
+    """SQL with literals replaced by placeholders, for grouping."""
+    sql = STRING.sub('%s', sql)
+    sql = NUMBER.sub('%s', sql)
+    sql = SPACES.sub(' ', sql).strip()
+    return IN_LIST.sub('IN (...)', sql)
+
+
+def is_single_key_lookup(normalized_sql):
+    """Whether the statement loads rows by one column equality,
+    which is what lazy FK and reverse FK access produce."""
+    return normalized_sql.startswith('SELECT') and bool(
+        SINGLE_KEY_LOOKUP.search(normalized_sql)
+    )
@@ -0,0 +1,64 @@
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+_current = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """What one request spent in the database, the cache and
+    template rendering."""
+
+    def __init__(self):
+        self.view_name = None
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_time = 0.0
+        self.template_time = 0.0
+        self.rendering = False
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+def get_current():
+    return _current.get()
+
+
+@contextmanager
+def collect():
+    """Collect stats of the code inside; nested calls share one object."""
+    stats = _current.get()
+    if stats is not None:
+        yield stats
+        return
+    stats = RequestStats()
+    token = _current.set(stats)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def track_queries():
+    """Count the queries of this thread in the stats of the request that
+    handed the work over, e.g. from an executor thread."""
+    stats = _current.get()
+    with ExitStack() as stack:
+        if stats is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+        yield
@@ -0,0 +1,131 @@
+"""Attribution of render time to templates, tags and filters.
+
+With `TEMPLATE_PROFILING` enabled every template, tag and filter rendered
+while a `Profile` is active is timed; `TemplateProfileMiddleware` starts
+one per request.
+"""
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+
+from django.template import base
+
+_current = ContextVar('template_profile', default=None)
+_instrumented = False
+
+
+class Profile:
+    """Cumulative and self time per template, tag and filter of one
+    render and the self time of every stack for flamegraphs."""
+
+    def __init__(self):
+        self.frames = []
+        self.active = Counter()
+        self.cumulative = defaultdict(float)
+        self.own = defaultdict(float)
+        self.stacks = defaultdict(float)
+        self.total = 0.0
+
+    def enter(self, name):
+        path = f'{self.frames[-1][1]};{name}' if self.frames else name
+        self.frames.append([name, path, time.perf_counter(), 0.0])
+        self.active[name] += 1
+
+    def exit(self):
+        name, path, started, children = self.frames.pop()
+        elapsed = time.perf_counter() - started
+        if self.frames:
+            self.frames[-1][3] += elapsed
+        else:
+            self.total += elapsed
+        self.active[name] -= 1
+        if not self.active[name]:
+            # Recursive frames are already part of the outermost one.
+            self.cumulative[name] += elapsed
+        self.own[name] += elapsed - children
+        self.stacks[path] += elapsed - children
+
+    def top(self, count):
+        """(name, cumulative, self) of the `count` slowest entries."""
+        names = sorted(self.own, key=self.own.get, reverse=True)[:count]
+        return [(name, self.cumulative[name], self.own[name])
+                for name in names]
+
+    def write(self, path):
+        """Append the stacks in the collapsed format of flamegraph.pl,
+        weighted in microseconds."""
+        lines = ''.join(
+            f'{stack} {round(seconds * 1_000_000)}\n'
+            for stack, seconds in self.stacks.items()
+            if seconds >= 0.0000005
+        )
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as stream:
+            stream.write(lines)
+
+
+@contextmanager
+def profile():
+    """Profile template rendering of the code inside."""
+    current = Profile()
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+
+
+def _node_name(node):
+    if isinstance(node, base.TextNode):
+        return None
+    if isinstance(node, base.VariableNode):
+        return 'var'
+    token = getattr(node, 'token', None)
+    if token is None:
+        return f'tag:{type(node).__name__}'
+    return f'tag:{token.split_contents()[0]}'
+
+
+def _template_name(template):
+    return f'template:{template.origin.template_name or template.name}'
+
+
+def _filter_name(expression):
+    if not expression.filters:
+        return None
+    return 'filter:' + '|'.join(
+        getattr(func, '_filter_name', func.__name__)
+        for func, _ in expression.filters
+    )
+
+
+def _timed(method, get_name):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        current = _current.get()
+        name = current and get_name(self)
+        if not name:
+            return method(self, *args, **kwargs)
+        current.enter(name)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            current.exit()
+    return wrapper
+
+
+def instrument():
+    """Wrap template, node and filter rendering with timers, once."""
+    global _instrumented
+    if _instrumented:
+        return
+    base.Template._render = _timed(base.Template._render, _template_name)
+    base.Node.render_annotated = _timed(
+        base.Node.render_annotated, _node_name)
+    base.FilterExpression.resolve = _timed(
+        base.FilterExpression.resolve, _filter_name)
+    _instrumented = True
@@ -0,0 +1,15 @@
+def _quote(value):
+    return '"{}"'.format(str(value).replace('\\', '\\\\').replace('"', '\\"'))
+
+
+def add_server_timing(response, name, duration=None, description=None):
+    """Append a metric to the `Server-Timing` header, `duration` is
+    in milliseconds."""
+    metric = name
+    if description is not None:
+        metric += f';desc={_quote(description)}'
+    if duration is not None:
+        metric += f';dur={duration:.2f}'
+    if response.has_header('Server-Timing'):
+        metric = f'{response["Server-Timing"]}, {metric}'
+    response['Server-Timing'] = metric
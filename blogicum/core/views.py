@@ -0,0 +1,19 @@
+import hmac
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+
+from . import metrics
+
+
+def metrics_view(request):
+    """Prometheus endpoint for staff or holders of `METRICS_TOKEN`."""
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get('Authorization', '')
+    if not (request.user.is_staff or token and hmac.compare_digest(
+            authorization, f'Bearer {token}')):
+        raise PermissionDenied
+    return HttpResponse(
+        metrics.export(), content_type='text/plain; version=0.0.4'
+    )
@@ -0,0 +1,119 @@
+"""Serialization of write transactions across the workers of one host.
+
+SQLite has a single writer, and a deferred transaction that turns into a
+write fails at once with "database is locked" instead of waiting. Writers
+take an exclusive `flock` on a per-database file first, so they queue up
+with a bounded wait, and then start the transaction with
+`BEGIN IMMEDIATE`. A lock error from a writer that bypassed the queue is
+retried with jitter.
+"""
+import fcntl
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from hashlib import md5
+from pathlib import Path
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+)
+from django.http import HttpResponse
+
+from . import metrics
+
+MAX_SLEEP = 0.05
+
+_local = threading.local()
+
+
+class WriteLockTimeout(Exception):
+    pass
+
+
+def _lock_path(using):
+    name = str(connections[using].settings_dict['NAME'])
+    directory = Path(settings.WRITE_LOCK_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f'{md5(name.encode()).hexdigest()}.lock'
+
+
+@contextmanager
+def write_lock(using=DEFAULT_DB_ALIAS):
+    """Hold the write lock of the `using` database, reentrant."""
+    held = getattr(_local, 'held', set())
+    if using in held:
+        yield
+        return
+    started = time.monotonic()
+    deadline = started + settings.WRITE_LOCK_TIMEOUT
+    delay = 0.001
+    with open(_lock_path(using), 'a') as stream:
+        while True:
+            try:
+                fcntl.flock(stream, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    metrics.WRITE_LOCK_TIMEOUTS.inc(using)
+                    raise WriteLockTimeout(
+                        f'Не дождались блокировки записи в {using}.')
+                time.sleep(min(remaining, random.uniform(0, delay)))
+                delay = min(delay * 2, MAX_SLEEP)
+        metrics.WRITE_LOCK_WAIT.observe(time.monotonic() - started, using)
+        _local.held = held | {using}
+        try:
+            yield
+        finally:
+            _local.held = held
+            fcntl.flock(stream, fcntl.LOCK_UN)
+
+
+def _is_locked_error(error):
+    return 'locked' in str(error) or 'busy' in str(error)
+
+
+def serialized_write(func=None, *, using=DEFAULT_DB_ALIAS):
+    """Run `func` in a transaction under the write lock and retry it
+    on lock errors."""
+    if func is None:
+        return lambda func: serialized_write(func, using=using)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if connections[using].in_atomic_block:
+            # The outer transaction has already started, so the
+            # statements can't be retried from here, and with
+            # `BEGIN IMMEDIATE` it holds the SQLite lock already: taking
+            # the flock now would reverse the lock order. Views that
+            # write in an outer transaction take `write_lock` first.
+            with transaction.atomic(using=using):
+                return func(*args, **kwargs)
+        for attempt in range(settings.WRITE_RETRIES + 1):
+            try:
+                with write_lock(using), transaction.atomic(using=using):
+                    return func(*args, **kwargs)
+            except OperationalError as error:
+                if (not _is_locked_error(error)
+                        or attempt == settings.WRITE_RETRIES):
+                    raise
+                metrics.WRITE_RETRIES.inc(using)
+                time.sleep(random.uniform(0, MAX_SLEEP * 2 ** attempt))
+
+    return wrapper
+
+
+class SerializedWriteMixin:
+    """Save the form of an edit view through `serialized_write`."""
+
+    def form_valid(self, form):
+        try:
+            return serialized_write(super().form_valid)(form)
+        except WriteLockTimeout:
+            return HttpResponse(
+                'Сервер перегружен, повторите попытку позже.',
+                status=503, headers={'Retry-After': '1'}
+            )
@@ -0,0 +1,30 @@
+// Adds a search box to every select rendered by AutocompleteSelect and
+// fills the select with the matches from its JSON endpoint.
+document.querySelectorAll('select[data-autocomplete-url]').forEach((select) => {
+  const search = document.createElement('input');
+  search.type = 'search';
+  search.className = 'form-control mb-1';
+  search.placeholder = 'Начните вводить название';
+  select.before(search);
+
+  let timer = null;
+  search.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(async () => {
+      const url = new URL(select.dataset.autocompleteUrl, window.location);
+      url.searchParams.set('term', search.value);
+      const response = await fetch(url);
+      if (!response.ok) {
+        return;
+      }
+      const {results} = await response.json();
+      const kept = [...select.options].filter(
+        (option) => !option.value || option.selected,
+      );
+      const options = results
+        .filter(({id}) => !kept.some((option) => option.value === String(id)))
+        .map(({id, text}) => new Option(text, id));
+      select.replaceChildren(...kept, ...options);
+    }, 250);
+  });
+});
@@ -0,0 +1,48 @@
+import pytest
+
+from blog.models import FeedEntry, Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_post_changelist_queries_do_not_grow(
+        admin_client, django_assert_max_num_queries,
+        many_posts_with_published_locations):
+    with django_assert_max_num_queries(12):
+        response = admin_client.get('/admin/blog/post/')
+    assert response.status_code == 200
+    with django_assert_max_num_queries(12):
+        admin_client.get('/admin/blog/comment/')
+
+
+def test_bulk_unpublish_and_publish(admin_client,
+                                    many_posts_with_published_locations):
+    pks = [post.pk for post in many_posts_with_published_locations[:3]]
+    admin_client.post('/admin/blog/post/', {
+        'action': 'unpublish', '_selected_action': pks})
+    assert not Post.objects.filter(pk__in=pks, is_visible=True).exists(), (
+        'Убедитесь, что действие «снять с публикации» скрывает публикации.'
+    )
+    assert not FeedEntry.objects.filter(post__in=pks).exists()
+
+    admin_client.post('/admin/blog/post/', {
+        'action': 'publish', '_selected_action': pks})
+    assert FeedEntry.objects.filter(post__in=pks).count() == 3
+
+
+def test_category_action_refreshes_only_its_posts(
+        admin_client, mixer, post_with_published_location):
+    other = mixer.blend(
+        'blog.Post', category=mixer.blend('blog.Category', is_published=True))
+    # A stale flag outside the selection must stay untouched.
+    Post.objects.filter(pk=other.pk).update(is_visible=False)
+    category = post_with_published_location.category
+    admin_client.post('/admin/blog/category/?is_published__exact=1', {
+        'action': 'unpublish', '_selected_action': [category.pk]})
+    assert not Post.objects.get(pk=post_with_published_location.pk).is_visible
+    assert not Post.objects.get(pk=other.pk).is_visible, (
+        'Убедитесь, что действие обновляет видимость только затронутых '
+        'публикаций.'
+    )
@@ -0,0 +1,68 @@
+import json
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+
+import pytest
+from django.test.client import Client
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _get_json(client: Client, url: str):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Убедитесь, что `{url}` отвечает без ошибок.'
+    )
+    if response.streaming:
+        return json.loads(b''.join(response.streaming_content))
+    return json.loads(response.content)
+
+
+def test_post_list_cursor_pagination(
+        client: Client, many_posts_with_published_locations):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id), reverse=True)
+    seen = []
+    url = '/api/posts/?limit=7&fields=id,title'
+    while url:
+        data = _get_json(client, url)
+        for item in data['results']:
+            assert set(item) == {'id', 'title'}, (
+                'Убедитесь, что параметр `fields` ограничивает набор полей.'
+            )
+            seen.append(item['id'])
+        url = data['next']
+    assert seen == [post.id for post in expected], (
+        'Убедитесь, что курсорная пагинация возвращает все посты '
+        'по убыванию даты публикации без повторов.'
+    )
+
+
+def test_post_detail_and_comments(client: Client, comment_to_a_post):
+    post = comment_to_a_post.post
+    data = _get_json(client, f'/api/posts/{post.id}/')
+    assert data['title'] == post.title
+    assert data['comment_count'] == 1
+    data = _get_json(client, f'/api/posts/{post.id}/comments/')
+    assert [item['id'] for item in data['results']] == [comment_to_a_post.id]
+    for url in (f'/api/category/{post.category.slug}/posts/',
+                f'/api/profile/{post.author.username}/posts/'):
+        data = _get_json(client, url)
+        assert [item['id'] for item in data['results']] == [post.id]
+
+
+def test_api_errors(client: Client, future_posts):
+    assert client.get(f'/api/posts/{future_posts[0].id}/').status_code == (
+        HTTPStatus.NOT_FOUND)
+    assert client.get('/api/posts/?fields=password').status_code == (
+        HTTPStatus.BAD_REQUEST)
+    assert client.get('/api/posts/?cursor=broken').status_code == (
+        HTTPStatus.BAD_REQUEST)
+    cursor = urlsafe_b64encode(b'["nope", 1]').decode()
+    assert client.get(f'/api/posts/?cursor={cursor}').status_code == (
+        HTTPStatus.BAD_REQUEST), (
+        'Убедитесь, что cursor с некорректной датой возвращает ошибку 400.'
+    )
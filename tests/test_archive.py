@@ -0,0 +1,46 @@
+import pytest
+from django.core.management import call_command
+
+from blog.archive import ChainedPosts
+from blog.models import ArchivedComment, ArchivedPost, FeedEntry, Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_archived_post_still_readable(user_client, mixer, user,
+                                           post_with_published_location):
+    post = post_with_published_location
+    mixer.blend('blog.Comment', post=post, author=user, text='Старый')
+    call_command('archive_posts', days=0, pause=0, stdout=None)
+
+    assert not Post.objects.filter(pk=post.pk).exists(), (
+        'Убедитесь, что архивированная публикация удаляется из `Post`.'
+    )
+    assert not FeedEntry.objects.filter(post_id=post.pk).exists()
+    archived = ArchivedPost.objects.get(pk=post.pk)
+    assert archived.created_at == post.created_at
+    assert ArchivedComment.objects.filter(post=archived).count() == 1
+
+    response = user_client.get(f'/posts/{post.pk}/')
+    assert response.status_code == 200, (
+        'Убедитесь, что страница архивной публикации доступна.'
+    )
+    content = response.content.decode()
+    assert post.title in content and 'Старый' in content
+
+    response = user_client.get(f'/profile/{post.author.username}/')
+    assert post.title in response.content.decode(), (
+        'Убедитесь, что архивные публикации показываются в профиле автора.'
+    )
+
+
+def test_chained_posts_slices():
+    chained = ChainedPosts([1, 2, 3], [4, 5])
+    chained._counts = 3, 2
+    assert len(chained) == 5
+    assert chained[0:2] == [1, 2]
+    assert chained[2:4] == [3, 4]
+    assert chained[3:10] == [4, 5]
+    assert chained[4] == 5
@@ -0,0 +1,68 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import AsyncClient, RequestFactory
+
+from blog import async_views
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True)
+]
+
+
+def call(view, user=None, **kwargs):
+    request = RequestFactory().get('/')
+    request.user = user or AnonymousUser()
+    return async_to_sync(view)(request, **kwargs)
+
+
+def test_async_feeds(post_with_published_location):
+    post = post_with_published_location
+    for _ in range(2):
+        content = call(async_views.index).content.decode()
+        assert post.title in content, (
+            'Убедитесь, что асинхронная главная страница показывает '
+            'публикации, в том числе из кеша карточек.'
+        )
+    post.title = 'Новый заголовок'
+    post.save()
+    assert 'Новый заголовок' in call(async_views.index).content.decode()
+
+    content = call(
+        async_views.category_posts, category_slug=post.category.slug
+    ).content.decode()
+    assert 'Новый заголовок' in content
+    with pytest.raises(Http404):
+        call(async_views.category_posts, category_slug='missing')
+
+
+def test_async_profile_and_detail(mixer, user,
+                                  post_with_published_location):
+    post = post_with_published_location
+    mixer.blend('blog.Comment', post=post, author=user, text='Асинхронно')
+    content = call(
+        async_views.profile, username=post.author.username
+    ).content.decode()
+    assert post.title in content
+
+    assert call(async_views.post_detail, pk=post.pk).status_code == 302
+    content = call(async_views.post_detail, user, pk=post.pk).content.decode()
+    assert post.title in content and 'Асинхронно' in content
+
+
+def test_middleware_under_asgi(post_with_published_location):
+    response = async_to_sync(AsyncClient().get)('/')
+    assert response.status_code == 200
+    assert 'total;dur=' in response['Server-Timing']
+
+
+def test_cards_follow_author_rename(post_with_published_location):
+    author = post_with_published_location.author
+    assert f'@{author.username}' in call(async_views.index).content.decode()
+    author.username = 'renamed'
+    author.save()
+    assert '@renamed' in call(async_views.index).content.decode(), (
+        'Убедитесь, что после смены имени пользователя карточки в ленте '
+        'показывают новое имя.'
+    )
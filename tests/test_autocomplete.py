@@ -0,0 +1,49 @@
+import pytest
+
+from blog.api import AUTOCOMPLETE
+from blog.forms import PostForm
+from blog.utils import prefix_search
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_autocomplete_by_indexed_prefix(client, mixer):
+    mixer.blend('blog.Category', title='Путешествия', is_published=True)
+    mixer.blend('blog.Category', title='Путь', is_published=False)
+    mixer.cycle(5).blend('blog.Category', is_published=True)
+
+    response = client.get('/api/autocomplete/category/?term=пут')
+    assert [item['text'] for item in response.json()['results']] == [
+        'Путешествия'
+    ], (
+        'Убедитесь, что автодополнение ищет опубликованные категории '
+        'по началу названия без учёта регистра первой буквы.'
+    )
+    assert client.get('/api/autocomplete/author/?term=a').status_code == 404
+
+    queryset, label = AUTOCOMPLETE['category']
+    plan = prefix_search(queryset, label, 'пут').explain()
+    assert 'category_title_idx' in plan
+
+
+def test_post_form_renders_only_chosen_options(mixer, django_assert_num_queries):
+    categories = mixer.cycle(20).blend('blog.Category')
+    form = PostForm(initial={'category': categories[0].pk})
+    with django_assert_num_queries(1):
+        html = str(form['category'])
+    assert html.count('<option') == 2
+    assert 'data-autocomplete-url="/api/autocomplete/category/"' in html
+    with django_assert_num_queries(0):
+        assert str(PostForm()['location']).count('<option') == 1
+
+
+def test_admin_autocomplete(admin_client, mixer):
+    mixer.blend('blog.Location', name='Москва')
+    response = admin_client.get('/admin/autocomplete/', {
+        'term': 'моск', 'app_label': 'blog', 'model_name': 'post',
+        'field_name': 'location'})
+    assert [item['text'] for item in response.json()['results']] == [
+        'Москва'
+    ]
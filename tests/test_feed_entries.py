@@ -0,0 +1,49 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import FeedEntry
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def get_entry(post):
+    return FeedEntry.objects.filter(post=post).first()
+
+
+def test_entry_follows_post_and_comments(post_with_published_location,
+                                         mixer, user):
+    post = post_with_published_location
+    entry = get_entry(post)
+    assert entry is not None, (
+        'Убедитесь, что видимая публикация попадает в таблицу ленты.'
+    )
+    assert (entry.category_slug, entry.author_username) == (
+        post.category.slug, post.author.username
+    )
+
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    assert get_entry(post).comment_count == 1
+    comment.delete()
+    assert get_entry(post).comment_count == 0
+
+    post.category.slug = 'renamed'
+    post.category.save()
+    assert get_entry(post).category_slug == 'renamed'
+
+    post.is_published = False
+    post.save()
+    assert get_entry(post) is None
+
+
+def test_index_reads_feed_table(client, post_with_published_location):
+    FeedEntry.objects.all().delete()
+    assert post_with_published_location.title not in client.get(
+        '/').content.decode()
+
+    call_command('rebuild_feed', stdout=None)
+    response = client.get('/')
+    assert post_with_published_location.title in response.content.decode()
+    post = response.context['page_obj'][0]
+    assert post.comment_count == 0
@@ -0,0 +1,83 @@
+import json
+import os
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.test.client import Client
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.mark.parametrize('url', ['/feed/rss/', '/feed/atom/'])
+def test_site_feed(client: Client, post_with_published_location, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Убедитесь, что лента по адресу `{url}` отображается без ошибок.'
+    )
+    assert post_with_published_location.title in response.content.decode(), (
+        f'Убедитесь, что лента по адресу `{url}` содержит '
+        'опубликованные посты.'
+    )
+
+
+def test_category_and_author_feeds(client: Client,
+                                   post_with_published_location):
+    post = post_with_published_location
+    for url in (f'/category/{post.category.slug}/rss/',
+                f'/profile/{post.author.username}/atom/'):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert post.title in response.content.decode()
+    response = client.get('/category/not-a-category/rss/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_feed_conditional_get(client: Client, post_with_published_location):
+    response = client.get('/feed/rss/')
+    etag = response['ETag']
+    response = client.get('/feed/rss/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что лента возвращает 304 для неизменившегося ETag.'
+    )
+    response = client.get(
+        '/feed/rss/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    post_with_published_location.title = 'Обновлённый заголовок'
+    post_with_published_location.save()
+    response = client.get('/feed/rss/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что изменение поста сбрасывает кэш ленты.'
+    )
+    assert 'Обновлённый заголовок' in response.content.decode()
+
+
+def test_unread_query_params_share_cache_entry(
+        client: Client, many_posts_with_published_locations):
+    etag = client.get('/feed/rss/')['ETag']
+    assert client.get('/feed/rss/?x=1')['ETag'] == etag, (
+        'Убедитесь, что посторонние параметры запроса не создают новые '
+        'записи в кеше.'
+    )
+    first = json.loads(b''.join(
+        client.get('/api/posts/?limit=1').streaming_content))
+    response = client.get('/api/posts/?x=1&limit=1')
+    assert json.loads(response.content) == first
+    assert 'x=1' not in first['next']
+    assert client.get('/api/posts/?limit=2')['ETag'] != (
+        client.get('/api/posts/?limit=1')['ETag'])
+
+
+def test_version_bumped_by_another_process(client: Client,
+                                           post_with_published_location):
+    etag = client.get('/feed/rss/')['ETag']
+    # What `publish_scheduled` or another worker leaves behind.
+    later = os.stat(settings.FEED_VERSION_FILE).st_mtime_ns + 10 ** 9
+    os.utime(settings.FEED_VERSION_FILE, ns=(later, later))
+    response = client.get('/feed/rss/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что версия лент общая для всех процессов.'
+    )
@@ -0,0 +1,32 @@
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post, User
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_generate_data():
+    call_command('generate_data', users=20, categories=3, locations=5,
+                 posts=200, comments=300, batch_size=50, future_share=0.2,
+                 seed=7)
+    assert User.objects.count() == 20
+    assert Category.objects.count() == 3
+    assert Location.objects.count() == 5
+    assert Post.objects.count() == 200
+    assert Comment.objects.count() == 300
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists(), (
+        'Убедитесь, что generate_data создаёт отложенные публикации.'
+    )
+    titles = list(Post.objects.order_by('pk').values_list('title', flat=True))
+    for model in (Comment, Post, Category, Location, User):
+        model.objects.all().delete()
+    call_command('generate_data', users=20, categories=3, locations=5,
+                 posts=200, comments=300, batch_size=50, future_share=0.2,
+                 seed=7)
+    assert titles == list(
+        Post.objects.order_by('pk').values_list('title', flat=True)
+    ), 'Убедитесь, что generate_data воспроизводим при одинаковом seed.'
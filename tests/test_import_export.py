@@ -0,0 +1,94 @@
+import gzip
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from blog.archive import archive
+from blog.management.commands.import_data import deferred_indexes
+from blog.models import ArchivedComment, ArchivedPost, Comment, Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_export_import_roundtrip(tmp_path, mixer, comment_to_a_post,
+                                 many_posts_with_published_locations):
+    old_post = many_posts_with_published_locations[0]
+    old_comment = mixer.blend('blog.Comment', post=old_post)
+    archive([old_post.pk])
+    call_command('export_data', output=str(tmp_path), gzip=True,
+                 batch_size=7)
+    with gzip.open(tmp_path / 'blog.post.jsonl.gz', 'rt') as stream:
+        records = [json.loads(line) for line in stream]
+    expected = {
+        post.pk: post.title for post in Post.objects.all()
+    }
+    assert {record['pk']: record['fields']['title']
+            for record in records} == expected, (
+        'Убедитесь, что export_data выгружает все посты.'
+    )
+
+    created_at = Post.objects.order_by('pk').values_list(
+        'created_at', flat=True).first()
+    Comment.objects.all().delete()
+    Post.objects.all().delete()
+    ArchivedPost.objects.all().delete()
+    call_command('import_data', *(
+        str(tmp_path / f'blog.{name}.jsonl.gz') for name in (
+            'archivedcomment', 'comment', 'archivedpost', 'post')
+    ), batch_size=5)
+    assert dict(Post.objects.values_list('pk', 'title')) == expected, (
+        'Убедитесь, что import_data загружает выгруженные посты.'
+    )
+    assert Comment.objects.filter(pk=comment_to_a_post.pk).exists()
+    assert ArchivedComment.objects.filter(
+        pk=old_comment.pk, post_id=old_post.pk).exists(), (
+        'Убедитесь, что архивные публикации и комментарии переживают '
+        'выгрузку и загрузку.'
+    )
+    assert Post.objects.order_by('pk').values_list(
+        'created_at', flat=True).first().replace(microsecond=0) == (
+        created_at.replace(microsecond=0)), (
+        'Убедитесь, что import_data сохраняет исходные даты создания.'
+    )
+
+
+def test_import_fixture_array(tmp_path, post_with_published_location):
+    post = post_with_published_location
+    fixture = tmp_path / 'fixture.json'
+    fixture.write_text(json.dumps([{
+        'model': 'blog.post',
+        'pk': post.pk + 100,
+        'fields': {
+            'title': 'Из фикстуры', 'text': 'x' * 100_000,
+            'pub_date': '2022-12-18T23:06:18.993Z',
+            'author': post.author_id, 'category': post.category_id,
+            'location': None, 'is_published': True,
+            'created_at': '2022-12-18T23:06:18.993Z', 'image': ''
+        }
+    }], indent=2))
+    call_command('import_data', str(fixture))
+    assert Post.objects.get(pk=post.pk + 100).title == 'Из фикстуры'
+
+
+def test_only_loaded_tables_lose_indexes():
+    def indexes(table):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND sql IS NOT NULL AND tbl_name = %s", [table])
+            return {name for name, in cursor.fetchall()}
+
+    post_indexes, comment_indexes = (
+        indexes('blog_post'), indexes('blog_comment'))
+    with deferred_indexes(connection) as defer:
+        defer('blog_post')
+        assert not indexes('blog_post') & {'post_deleted_idx'}
+        assert indexes('blog_comment') == comment_indexes, (
+            'Убедитесь, что import_data не трогает индексы таблиц, '
+            'которых нет во входных данных.'
+        )
+    assert indexes('blog_post') == post_indexes
@@ -0,0 +1,85 @@
+import os
+import re
+import subprocess
+import sys
+import threading
+from http import HTTPStatus
+
+import pytest
+
+from core import metrics
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture(autouse=True)
+def metrics_dir(settings, tmp_path):
+    settings.METRICS_DIR = tmp_path / 'metrics'
+    settings.METRICS_TOKEN = 'secret'
+    return settings.METRICS_DIR
+
+
+def get_sample(text, name):
+    match = re.search(rf'^{re.escape(name)} (\S+)$', text, re.MULTILINE)
+    assert match, f'Убедитесь, что метрика `{name}` экспортируется.'
+    return float(match.group(1))
+
+
+def test_values_are_summed_across_writers():
+    counter = metrics.Counter('test_events_total', 'События.', ('kind',))
+    try:
+        threads = [
+            threading.Thread(
+                target=lambda: [counter.inc('a') for _ in range(1000)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc('a', amount=0.5)
+        text = metrics.export()
+    finally:
+        metrics.REGISTRY.remove(counter)
+    assert get_sample(text, 'test_events_total{kind="a"}') == 4000.5
+
+
+def test_metrics_endpoint(client, post_with_published_location):
+    for _ in range(2):
+        client.get('/')
+    assert client.get('/metrics/').status_code == HTTPStatus.FORBIDDEN, (
+        'Убедитесь, что метрики недоступны без токена.'
+    )
+    response = client.get('/metrics/', HTTP_AUTHORIZATION='Bearer secret')
+    assert response.status_code == HTTPStatus.OK
+    text = response.content.decode()
+    assert get_sample(
+        text, 'blogicum_requests_total{view="blog:index",status="200"}'
+    ) == 2
+    assert get_sample(
+        text, 'blogicum_request_duration_seconds_bucket'
+              '{view="blog:index",le="+Inf"}'
+    ) == 2
+    assert get_sample(text, 'blogicum_db_queries_total{view="blog:index"}')
+
+
+def test_files_of_exited_processes_are_merged(metrics_dir):
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    metrics_dir.mkdir(parents=True)
+    dead = metrics_dir / f'{process.pid}.db'
+    values = metrics.MmapValues(dead)
+    values.add('blogicum_requests_total{view="x",status="200"}', 2)
+    values.close()
+    metrics.REQUESTS.inc('x', '200')
+    for _ in range(2):
+        text = metrics.export()
+        assert get_sample(
+            text, 'blogicum_requests_total{view="x",status="200"}') == 3
+    assert not dead.exists(), (
+        'Убедитесь, что файлы завершившихся процессов объединяются.'
+    )
+    assert {path.name for path in metrics_dir.glob('*.db')} == {
+        f'{os.getpid()}.db', metrics.MERGED_FILE}
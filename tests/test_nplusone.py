@@ -0,0 +1,41 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from blog.models import Post
+from core.nplusone import NPlusOneError, QueryGroups, report
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_detects_lazy_fk_loads(many_posts_with_published_locations):
+    groups = QueryGroups(threshold=3)
+    with connection.execute_wrapper(groups):
+        for post in Post.objects.all():
+            post.location.name
+    problems = groups.problems()
+    assert len(problems) == 1, (
+        'Убедитесь, что повторяющиеся загрузки по внешнему ключу '
+        'распознаются как N+1.'
+    )
+    sql, count, _, _ = problems[0]
+    assert '"blog_location"' in sql
+    assert count == len(many_posts_with_published_locations)
+
+
+def test_report_raises(settings):
+    settings.NPLUSONE_RAISE = True
+    with pytest.raises(NPlusOneError):
+        report('blog:index', [('SELECT 1', 3, None, None)])
+
+
+@pytest.mark.parametrize('url', ['/', '/profile/{username}/'])
+def test_feeds_have_no_nplusone(settings, user_client,
+                                many_posts_with_published_locations, url):
+    settings.NPLUSONE_RAISE = True
+    user = many_posts_with_published_locations[0].author
+    response = user_client.get(url.format(username=user.username))
+    assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,32 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_profile_edit_is_lean(user_client, user,
+                              django_assert_max_num_queries):
+    with django_assert_max_num_queries(4):
+        response = user_client.get('/profile/edit/')
+    content = response.content.decode()
+    assert 'user_permissions' not in content and 'password' not in content, (
+        'Убедитесь, что форма профиля не показывает права, группы и пароль.'
+    )
+
+    with CaptureQueriesContext(connection) as context:
+        user_client.post('/profile/edit/', {
+            'first_name': user.first_name, 'last_name': 'Новая',
+            'username': user.username, 'email': user.email,
+        })
+    updates = [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('UPDATE "auth_user"')
+    ]
+    assert len(updates) == 1 and 'password' not in updates[0], (
+        'Убедитесь, что сохранение профиля пишет только изменённые поля.'
+    )
+    user.refresh_from_db()
+    assert user.last_name == 'Новая'
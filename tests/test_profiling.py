@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from core.profiling import Sampler
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_staff_request_is_profiled(settings, tmp_path, admin_client,
+                                   client):
+    settings.PROFILE_DIR = tmp_path
+    response = admin_client.get('/?profile=1')
+    assert (tmp_path / response['X-Profile-File']).stat().st_size > 0, (
+        'Убедитесь, что запрос сотрудника с `?profile=1` профилируется.'
+    )
+
+    response = client.get('/', HTTP_X_PROFILE='1')
+    assert not response.has_header('X-Profile-File'), (
+        'Убедитесь, что профилирование доступно только сотрудникам.'
+    )
+
+
+def test_sampler_writes_collapsed_stacks_by_view(tmp_path):
+    sampler = Sampler(0.001, tmp_path, flush_interval=60)
+    sampler.enter('blog:index')
+    sampler.start()
+    try:
+        deadline = time.process_time() + 0.2
+        while time.process_time() < deadline:
+            sum(range(1000))
+    finally:
+        sampler.exit()
+        sampler.stop()
+
+    lines = sampler.path.read_text().splitlines()
+    assert lines and all(
+        line.startswith('blog:index;') for line in lines
+    ), 'Убедитесь, что стеки помечены именем представления.'
+    assert any('test_sampler_writes' in line for line in lines)
+
+
+def test_sampler_flushes_outside_signal_handler(tmp_path):
+    sampler = Sampler(0.001, tmp_path, flush_interval=0)
+    sampler.enter('blog:index')
+    sampler.start()
+    try:
+        deadline = time.process_time() + 0.1
+        while time.process_time() < deadline:
+            sum(range(1000))
+        assert not sampler.path.exists(), (
+            'Убедитесь, что обработчик сигнала не пишет на диск.'
+        )
+        sampler.exit()
+        assert sampler.path.exists(), (
+            'Убедитесь, что стеки сохраняются при выходе из представления.'
+        )
+    finally:
+        sampler.stop()
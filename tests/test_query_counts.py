@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+from blog import benchmarks
+from blogicum.settings import BASE_DIR
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+BASELINE_SCALE = '1k'
+
+
+def test_query_counts_match_baseline():
+    baseline = benchmarks.load_baseline(
+        Path(BASE_DIR) / 'benchmarks' / 'baseline.json'
+    )[BASELINE_SCALE]
+    benchmarks.seed(benchmarks.SCALES[BASELINE_SCALE])
+    results = benchmarks.run(repeat=1)
+    assert set(results) == set(baseline), (
+        'Обновите базовую линию: `python manage.py benchmark_views '
+        '--update-baseline`.'
+    )
+    regressions = [
+        f'{name}: {result["queries"]} > {baseline[name]["queries"]}'
+        for name, result in results.items()
+        if result['queries'] > baseline[name]['queries']
+        or result['status'] != baseline[name]['status']
+    ]
+    assert not regressions, (
+        'Число запросов к БД выросло по сравнению с '
+        '`benchmarks/baseline.json`:\n' + '\n'.join(regressions)
+    )
@@ -0,0 +1,72 @@
+import sqlite3
+import time
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from blog.models import Post
+from core.management.commands.replicate import copy_database
+from core.replicas import (
+    STICKY_COOKIE, ReplicaRouter, RequestState, _state, replica_reads
+)
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+    return settings.DATABASE_REPLICAS
+
+
+def read_alias(model=Post):
+    return ReplicaRouter().db_for_read(model)
+
+
+def test_only_marked_blog_reads_go_to_replicas(replicas):
+    assert read_alias() is None
+    assert replica_reads(read_alias)() == 'replica'
+    assert replica_reads(read_alias)(get_user_model()) is None, (
+        'Убедитесь, что сессии и пользователи читаются с основной базы.'
+    )
+    assert ReplicaRouter().db_for_write(Post) == 'default'
+
+
+def test_writer_is_pinned_to_primary(replicas):
+    state = RequestState(pinned=False)
+    token = _state.set(state)
+    try:
+        assert replica_reads(read_alias)() == 'replica'
+        ReplicaRouter().db_for_write(Post)
+        assert replica_reads(read_alias)() == 'default', (
+            'Убедитесь, что после записи чтение идёт с основной базы.'
+        )
+    finally:
+        _state.reset(token)
+
+
+def test_write_sets_sticky_cookie(replicas, user_client,
+                                  post_with_published_location):
+    response = user_client.post(
+        f'/posts/{post_with_published_location.pk}/comment/',
+        data={'text': 'Комментарий'}
+    )
+    if STICKY_COOKIE not in response.cookies:
+        pytest.fail('Убедитесь, что после записи выставляется cookie '
+                    f'`{STICKY_COOKIE}`.')
+    assert float(response.cookies[STICKY_COOKIE].value) > time.time()
+
+
+def test_copy_database(tmp_path):
+    source = str(tmp_path / 'primary.sqlite3')
+    target = str(tmp_path / 'replica.sqlite3')
+    with sqlite3.connect(source) as connection:
+        connection.execute('CREATE TABLE item (value TEXT)')
+        connection.execute("INSERT INTO item VALUES ('a')")
+    copy_database(source, target)
+    with sqlite3.connect(target) as connection:
+        assert connection.execute('SELECT value FROM item').fetchall() == [
+            ('a',)
+        ]
@@ -0,0 +1,105 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.caching import get_feed_version
+from blog.management.commands.publish_scheduled import Command
+from blog.models import Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_visibility_is_computed_on_save(future_posts,
+                                        post_with_published_location):
+    assert not any(post.is_visible for post in future_posts), (
+        'Убедитесь, что отложенные публикации не видны в лентах.'
+    )
+    assert post_with_published_location.is_visible
+
+
+@pytest.fixture
+def scheduled_posts(mixer, user, published_category):
+    return mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=(
+            timezone.now() + timedelta(days=days) for days in (3, 1, 2)
+        )
+    )
+
+
+def test_scheduler_publishes_due_posts(scheduled_posts):
+    post = scheduled_posts[0]
+    heap = Command().load(limit=10)
+    assert heap[0][1] == scheduled_posts[1].pk, (
+        'Убедитесь, что очередь начинается с ближайшей публикации.'
+    )
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    version = get_feed_version()
+
+    call_command('publish_scheduled', once=True, verbosity=0)
+
+    assert Post.objects.published().filter(pk=post.pk).exists(), (
+        'Убедитесь, что `publish_scheduled` показывает наступившие '
+        'публикации.'
+    )
+    assert get_feed_version() != version, (
+        'Убедитесь, что при публикации сбрасывается кэш лент.'
+    )
+
+
+def test_category_change_updates_posts(post_with_published_location):
+    category = post_with_published_location.category
+    category.is_published = False
+    category.save()
+    assert not Post.objects.published().exists()
+
+    category.is_published = True
+    category.save()
+    assert Post.objects.published().exists()
+
+    category.delete()
+    assert not Post.objects.published().exists()
+
+
+class Stop(Exception):
+    pass
+
+
+def test_scheduler_reload_publishes_posts_outside_queue(
+        monkeypatch, scheduled_posts):
+    post = scheduled_posts[0]
+    real_sleep = time.sleep
+    deadline = time.monotonic() + 5
+
+    def sleep(seconds):
+        # Rescheduled after the queue was loaded, so it is not in it.
+        Post.objects.filter(pk=post.pk, is_visible=False).update(
+            pub_date=timezone.now() - timedelta(minutes=1))
+        if Post.objects.filter(pk=post.pk, is_visible=True).exists():
+            raise Stop
+        assert time.monotonic() < deadline, (
+            'Убедитесь, что `publish_scheduled` при каждой перезагрузке '
+            'показывает наступившие публикации.'
+        )
+        real_sleep(min(seconds, 0.01))
+
+    monkeypatch.setattr('time.sleep', sleep)
+    with pytest.raises(Stop):
+        call_command('publish_scheduled', limit=1, reload_interval=0.2,
+                     verbosity=0)
+
+
+def test_pub_date_string_is_accepted(user, published_category):
+    post = Post.objects.create(
+        title='Строка', author=user, category=published_category,
+        pub_date='2000-01-01T00:00:00Z')
+    assert post.is_visible, (
+        'Убедитесь, что pub_date можно передать строкой в формате ISO.'
+    )
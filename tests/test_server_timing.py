@@ -0,0 +1,21 @@
+import re
+
+import pytest
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_server_timing_breakdown(client, post_with_published_location):
+    response = client.get('/')
+    metrics = dict(
+        re.match(r'(\w+)(?:;desc="([^"]*)")?;dur=([\d.]+)', item).group(1, 3)
+        for item in response['Server-Timing'].split(', ')
+    )
+    assert {'url', 'view', 'template', 'db', 'cache', 'total'} <= set(
+        metrics
+    ), 'Убедитесь, что заголовок Server-Timing содержит все этапы запроса.'
+    assert float(metrics['template']) > 0
+    assert float(metrics['total']) >= float(metrics['template'])
+    assert 'db;desc="' in response['Server-Timing']
@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+from django.test.client import Client
+
+from blog.archive import archive
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_sitemap_index(client: Client, post_with_published_location):
+    response = client.get('/sitemap.xml')
+    assert response.status_code == HTTPStatus.OK
+    content = b''.join(response.streaming_content).decode()
+    for section in ('posts', 'archive', 'categories', 'profiles'):
+        assert f'/sitemap-{section}-0.xml' in content, (
+            'Убедитесь, что индекс карты сайта ссылается на раздел '
+            f'`{section}`.'
+        )
+
+
+def test_sitemap_section(client: Client, post_with_published_location,
+                         future_posts):
+    post = post_with_published_location
+    response = client.get('/sitemap-posts-0.xml')
+    assert response.status_code == HTTPStatus.OK
+    content = b''.join(response.streaming_content).decode()
+    assert f'/posts/{post.id}/' in content, (
+        'Убедитесь, что карта сайта содержит опубликованные посты.'
+    )
+    for future_post in future_posts:
+        assert f'/posts/{future_post.id}/' not in content, (
+            'Убедитесь, что карта сайта не содержит отложенные посты.'
+        )
+    etag = response['ETag']
+    response = client.get('/sitemap-posts-0.xml', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    response = client.get('/sitemap-posts-0.xml')
+    assert f'/posts/{post.id}/' in response.content.decode(), (
+        'Убедитесь, что страница карты сайта кэшируется.'
+    )
+    assert client.get('/sitemap-unknown-0.xml').status_code == (
+        HTTPStatus.NOT_FOUND)
+
+
+def test_archived_posts_stay_in_sitemap(client: Client,
+                                        post_with_published_location):
+    post = post_with_published_location
+    archive([post.pk])
+    content = b''.join(
+        client.get('/sitemap-archive-0.xml').streaming_content).decode()
+    assert f'/posts/{post.id}/' in content, (
+        'Убедитесь, что архивные публикации остаются в карте сайта.'
+    )
+    assert f'<lastmod>{post.pub_date.date().isoformat()}</lastmod>' in (
+        content)
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+
+from blog.models import Post
+from core import slowlog
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_slow_query_is_logged_with_plan(settings, tmp_path, capsys,
+                                        post_with_published_location):
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    settings.SLOW_QUERY_EXPLAIN_RATE = 1
+    settings.SLOW_QUERY_LOG_FILE = tmp_path / 'slow.log'
+    slowlog.stop()
+    with connection.execute_wrapper(slowlog.log_slow_queries):
+        list(Post.objects.filter(title=post_with_published_location.title))
+        with transaction.atomic():
+            list(Post.objects.filter(pk=post_with_published_location.pk))
+    slowlog.stop()
+
+    entries = [
+        json.loads(line)
+        for line in (tmp_path / 'slow.log').read_text().splitlines()
+    ]
+    entry = next(item for item in entries if 'blog_post' in item['sql'])
+    assert entry['plan'], (
+        'Убедитесь, что для медленного SELECT сохраняется план запроса.'
+    )
+    assert entry['params'] == [repr(post_with_published_location.title)]
+    entry = next(
+        item for item in entries if 'blog_post' in item['sql']
+        and item['params'] == [repr(post_with_published_location.pk)])
+    assert entry['plan'] is None, (
+        'Убедитесь, что EXPLAIN не выполняется внутри транзакции.'
+    )
+
+    call_command('slow_queries', path=str(tmp_path / 'slow.log'))
+    assert '"blog_post"' in capsys.readouterr().out
+
+
+def test_wrapper_survives_connection_opened_in_execute_wrapper():
+    def outer(execute, sql, params, many, context):
+        return execute(sql, params, many, context)
+
+    wrappers = connection.execute_wrappers
+    saved = list(wrappers)
+    wrappers.clear()
+    try:
+        with connection.execute_wrapper(outer):
+            slowlog.install(connection)
+        assert wrappers == [slowlog.log_slow_queries], (
+            'Убедитесь, что журнал медленных запросов остаётся подключён '
+            'после выхода из execute_wrapper().'
+        )
+    finally:
+        wrappers[:] = saved
@@ -0,0 +1,33 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, FeedEntry, Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_delete_hides_then_purge_removes(user_client, mixer, user,
+                                         post_with_published_location):
+    post = post_with_published_location
+    post.author = user
+    post.save()
+    mixer.cycle(5).blend('blog.Comment', post=post, author=user)
+
+    response = user_client.post(f'/posts/{post.pk}/delete/')
+    assert response.status_code == 302
+    assert not Post.objects.filter(pk=post.pk).exists(), (
+        'Убедитесь, что удалённая публикация не видна через `Post.objects`.'
+    )
+    assert not FeedEntry.objects.filter(post_id=post.pk).exists()
+    assert Comment.objects.filter(post_id=post.pk).count() == 5, (
+        'Убедитесь, что комментарии удаляются не в запросе, а позже.'
+    )
+    assert user_client.get(f'/posts/{post.pk}/').status_code == 404
+
+    call_command('purge_deleted', batch_size=2, pause=0, stdout=None)
+    assert not Post.all_objects.filter(pk=post.pk).exists(), (
+        'Убедитесь, что `purge_deleted` стирает удалённую публикацию.'
+    )
+    assert not Comment.objects.filter(post_id=post.pk).exists()
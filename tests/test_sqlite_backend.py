@@ -0,0 +1,25 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_pragmas_are_applied_on_connect():
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA temp_store')
+        assert cursor.fetchone()[0] == 2, (
+            'Убедитесь, что при подключении применяются PRAGMA SQLite.'
+        )
+        cursor.execute('PRAGMA synchronous')
+        assert cursor.fetchone()[0] == 1
+    assert connection.is_usable()
+
+
+def test_benchmark_command(capsys):
+    call_command('benchmark_sqlite', duration=0.3, readers=2, writers=1,
+                 rows=100)
+    output = capsys.readouterr().out
+    assert 'default' in output and 'tuned' in output
@@ -0,0 +1,47 @@
+import pytest
+from django.template import engines
+from django.test import Client
+
+from core import templates
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_profile_attributes_time_to_templates_and_tags():
+    templates.instrument()
+    template = engines['django'].from_string(
+        '{% for item in items %}{{ item|upper }}{% endfor %}'
+        '{% include "includes/category_link.html" %}'
+    )
+    with templates.profile() as profile:
+        template.render({
+            'items': ['a', 'b'],
+            'post': {'category': {'slug': 'travel', 'title': 'Путешествия'}},
+        })
+
+    assert profile.total > 0
+    assert {'tag:for', 'tag:include', 'filter:upper',
+            'template:includes/category_link.html'} <= set(profile.own), (
+        'Убедитесь, что профилировщик учитывает шаблоны, теги и фильтры.'
+    )
+    assert any(
+        stack.endswith('tag:include;template:includes/category_link.html')
+        for stack in profile.stacks
+    )
+    for name, cumulative, own in profile.top(100):
+        assert own <= cumulative + 1e-9
+
+
+def test_middleware_adds_server_timing_and_flamegraph(settings, tmp_path):
+    settings.TEMPLATE_PROFILING = True
+    settings.TEMPLATE_PROFILE_DIR = tmp_path
+    response = Client().get('/')
+
+    assert 'tpl;desc="templates"' in response['Server-Timing']
+    lines = (tmp_path / 'blog:index.folded').read_text().splitlines()
+    assert any('template:blog/index.html' in line for line in lines)
+    assert lines and all(
+        line.rsplit(' ', 1)[1].isdigit() for line in lines
+    ), 'Убедитесь, что стеки записаны в формате flamegraph.pl.'
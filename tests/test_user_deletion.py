@@ -0,0 +1,51 @@
+import pytest
+from django.core.management import call_command
+
+from blog.archive import archive
+from blog.models import Comment, DeletionJob, FeedEntry, Post, User
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_user_deleted_in_batches(admin_client, mixer, user, another_user,
+                                 post_with_published_location):
+    other_post = post_with_published_location
+    other_post.author = another_user
+    other_post.save()
+    own_posts = mixer.cycle(3).blend(
+        'blog.Post', author=user, category=other_post.category)
+    mixer.cycle(3).blend('blog.Comment', post=other_post, author=user)
+    mixer.blend('blog.Comment', post=own_posts[0], author=another_user)
+    archived = own_posts[2]
+    archive([archived.pk])
+
+    response = admin_client.post(
+        f'/admin/auth/user/{user.pk}/delete/', {'post': 'yes'})
+    assert response.status_code == 302
+    user.refresh_from_db()
+    assert not user.is_active, (
+        'Убедитесь, что удаление из админки сразу отключает пользователя.'
+    )
+    assert not Post.objects.filter(author=user).exists()
+    assert admin_client.get(f'/profile/{user.username}/').status_code == 404
+    assert admin_client.get(
+        f'/posts/{archived.pk}/').status_code == 404, (
+        'Убедитесь, что архивные публикации пользователя скрываются сразу.'
+    )
+    job = DeletionJob.objects.get(user=user)
+    assert (job.status, job.total) == (DeletionJob.PENDING, 6)
+
+    call_command('run_deletion_jobs', batch_size=2, pause=0, stdout=None)
+    job.refresh_from_db()
+    assert (job.status, job.deleted) == (DeletionJob.DONE, 6), (
+        'Убедитесь, что задача удаления доходит до конца.'
+    )
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert not Post.all_objects.filter(author_id=user.pk).exists()
+    assert not Comment.objects.filter(post__in=own_posts).exists()
+    assert FeedEntry.objects.get(post=other_post).comment_count == 0
+
+    response = admin_client.get('/admin/blog/deletionjob/')
+    assert '6 из 6' in response.content.decode()
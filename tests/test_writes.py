@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+from django.db import OperationalError
+
+from core import metrics
+from core.writes import serialized_write, write_lock
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture(autouse=True)
+def write_settings(settings, tmp_path):
+    settings.WRITE_LOCK_DIR = tmp_path / 'locks'
+    settings.METRICS_DIR = tmp_path / 'metrics'
+
+
+def test_write_lock_serializes_threads():
+    inside = []
+    overlaps = []
+
+    def work():
+        for _ in range(20):
+            with write_lock():
+                inside.append(1)
+                overlaps.append(len(inside))
+                time.sleep(0.0005)
+                inside.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(overlaps) == 1, (
+        'Убедитесь, что блокировка записи пускает только одного писателя.'
+    )
+    assert 'blogicum_write_lock_wait_seconds_count{database="default"} 80' \
+        in metrics.export()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_lock_errors_are_retried():
+    calls = []
+
+    @serialized_write
+    def write():
+        calls.append(1)
+        if len(calls) < 3:
+            raise OperationalError('database is locked')
+        return 'ok'
+
+    assert write() == 'ok'
+    assert len(calls) == 3
+    assert 'blogicum_write_retries_total{database="default"} 2' \
+        in metrics.export()
+
+
+def test_other_errors_are_not_retried():
+    calls = []
+
+    @serialized_write
+    def write():
+        calls.append(1)
+        raise OperationalError('no such table')
+
+    with pytest.raises(OperationalError):
+        write()
+    assert len(calls) == 1
+
+
+def test_nested_write_does_not_take_lock(settings):
+    settings.WRITE_LOCK_TIMEOUT = 0.05
+    locked = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with write_lock():
+            locked.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    locked.wait(5)
+    try:
+        # The test runs in a transaction, as an admin view does.
+        assert serialized_write(lambda: 1)() == 1, (
+            'Убедитесь, что запись внутри транзакции не ждёт блокировку '
+            'записи после начала транзакции.'
+        )
+    finally:
+        release.set()
+        thread.join()